@@ -0,0 +1,125 @@
+"""
+Soak test the memory use of building many parts.
+
+Each case builds a part over and over with a cycle of --variants different
+arguments, which is more than the caches hold, so that they keep evicting.
+After --warmup builds, memory is profiled (see bd_vslot.profiling) and
+sampled every --every builds, and the growth of each measure per 1000 builds
+is fitted to the samples. Once the caches are full, a part that doesn't leak
+grows by roughly nothing.
+
+Usage:
+    python benchmarks/soak.py -n 2000 [-k PATTERN] [-o results.json]
+"""
+
+import gc
+import json
+import re
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from bd_vslot import *
+from bd_vslot.cache import disk_cache
+from bd_vslot.profiling import MemoryUsage, memory_usage, profile
+
+
+def _rail_profile(i: int) -> Any:
+    return VSlot2020RailProfile(np.random.default_rng(i).random((3, 3)) < 0.7)
+
+
+CASES: dict[str, Callable[[int], Any]] = {
+    "VSlot2020RailProfile": _rail_profile,
+    "VSlot2020Rail": lambda i: VSlot2020Rail(100 + i),
+    "BuildPlateProfile": lambda i: BuildPlateProfile(
+        2 + i % 10, 2 + i // 10, BoltSize.M3
+    ),
+    "BuildPlate": lambda i: BuildPlate(2, 2 + i % 10, 2 + i // 10, BoltSize.M3),
+}
+
+
+def soak(
+    build: Callable[[int], Any],
+    builds: int = 1000,
+    every: int = 50,
+    warmup: int = 200,
+    variants: int = 200,
+) -> dict[str, Any]:
+    """
+    Build a part many times and measure the growth in memory use.
+
+    :raises ValueError: If there are fewer than 2 samples to fit.
+    :return: The growth of each measure of :class:`MemoryUsage` per 1000
+        builds, the final usage and the Python allocations that grew most.
+    """
+    for i in range(warmup):
+        build(i % variants)
+
+    samples: list[MemoryUsage] = []
+    with profile(memory=True) as profiler:
+        for i in range(builds):
+            build((warmup + i) % variants)
+            if i % every == every - 1:
+                gc.collect()
+                samples.append(memory_usage())
+
+    if len(samples) < 2:
+        raise ValueError(
+            f"{builds} builds sampled every {every} give {len(samples)} samples, "
+            f"but fitting the growth needs at least 2"
+        )
+    counts = every * np.arange(1, len(samples) + 1)
+    values = np.array(samples, dtype=float)
+    growth = {
+        name: 1000 * float(np.polyfit(counts, values[:, k], 1)[0])
+        for k, name in enumerate(MemoryUsage._fields)
+    }
+    return {
+        "growth_per_1000": growth,
+        "final": samples[-1]._asdict(),
+        "top_allocations": [str(stat) for stat in profiler.top_allocations(5)],
+    }
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Soak test the memory use of parts.")
+    parser.add_argument("-n", "--builds", type=int, default=1000)
+    parser.add_argument("-k", "--pattern", default="", help="regex of case names")
+    parser.add_argument("--every", type=int, default=50, help="builds per sample")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--variants", type=int, default=200)
+    parser.add_argument("-o", "--output", type=Path, help="JSON file to write")
+    args = parser.parse_args()
+    if args.every < 1 or args.builds < 2 * args.every:
+        parser.error("--builds must be at least twice --every, to take 2 samples")
+
+    disk_cache.directory = None
+    results = {}
+    print(f"{'case':<24} {'rss':>12} {'traced':>12} {'shapes':>8} {'builders':>8}")
+    for name, build in CASES.items():
+        if not re.search(args.pattern, name):
+            continue
+        result = soak(build, args.builds, args.every, args.warmup, args.variants)
+        results[name] = result
+        growth = result["growth_per_1000"]
+        print(
+            f"{name:<24} {growth['rss'] / 2**20:>10.2f}MB "
+            f"{growth['traced'] / 2**20:>10.2f}MB "
+            f"{growth['shapes']:>8.1f} {growth['builders']:>8.1f}",
+            flush=True,
+        )
+        for line in result["top_allocations"]:
+            print(f"    {line}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""
+Benchmark the construction time of every part class.
+
+Each case is built from cold caches and timed up to --repeat times, stopping
+early once a case has used --budget seconds. Results are written as JSON so
+that runs on different commits can be compared.
+
+Usage:
+    python benchmarks/suite.py -o results.json [-k PATTERN] [--compare base.json]
+"""
+
+import json
+import platform
+import re
+import subprocess
+from argparse import ArgumentParser
+from collections.abc import Callable
+from datetime import datetime, timezone
+from functools import partial
+from importlib.metadata import version
+from pathlib import Path
+from statistics import mean
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from bd_vslot import *
+from bd_vslot.cache import disk_cache, geometry_cache, profile_cache
+from bd_vslot.cutlist import Rail, cut_list
+
+
+def _random_array(size: int) -> np.ndarray:
+    """A reproducible, 70% filled array of rail positions."""
+    return np.random.default_rng(size).random((size, size)) < 0.7
+
+
+def _random_rails(count: int) -> list[Rail]:
+    """Reproducible rails of random lengths and quantities, of three profiles."""
+    rng = np.random.default_rng(count)
+    return [
+        Rail(float(length), int(quantity), *profile)
+        for profile in [(1, 1), (2, 1), (4, 2)]
+        for length, quantity in zip(
+            rng.integers(10, 150, count) * 10, rng.integers(1, 5, count)
+        )
+    ]
+
+
+CASES: dict[str, Callable[[], Any]] = {
+    "Bearing": lambda: Bearing(20, 10, 5),
+    "Bearing625": Bearing625,
+    "Bearing688": Bearing688,
+    "Bearing105": Bearing105,
+    "Wheel": lambda: Wheel(20, 10, 5, 3),
+    "VSlot2020Wheel": VSlot2020Wheel,
+    "VSlot2020MiniWheel": VSlot2020MiniWheel,
+    "VSlot2020SlidingTNut": lambda: VSlot2020SlidingTNut(BoltSize.M5),
+    "VSlot2020EndCapProfile": lambda: VSlot2020EndCapProfile(3, 2, BoltSize.M5, 1),
+    "VSlot2020EndCap": lambda: VSlot2020EndCap(2, 3, 2, BoltSize.M5, 1, 0.5),
+    "VSlot2020Rail": lambda: VSlot2020Rail(100, 2, 1),
+    "VSlot2020Rail[c_beam]": lambda: VSlot2020Rail(100, 4, 2, c_beam=True),
+}
+
+for _size in (1, 2, 4, 8, 12, 16):
+    CASES[f"VSlot2020RailProfile[box-{_size}x{_size}]"] = partial(
+        VSlot2020RailProfile, np.ones((_size, _size), dtype=bool)
+    )
+    CASES[f"VSlot2020RailProfile[random-{_size}x{_size}]"] = partial(
+        VSlot2020RailProfile, _random_array(_size)
+    )
+
+for _size in (1, 5, 10, 25, 50):
+    CASES[f"BuildPlateProfile[{_size}x{_size}]"] = partial(
+        BuildPlateProfile, _size, _size, BoltSize.M3, 1
+    )
+    CASES[f"BuildPlate[{_size}x{_size}]"] = partial(
+        BuildPlate, 2, _size, _size, BoltSize.M3, 1, 0.5
+    )
+
+for _radius in (0, 0.5, 1, 2):
+    CASES[f"LPlate[corner_radius={_radius}]"] = partial(
+        LPlate, 2, 4, 3, 2, BoltSize.M3, _radius
+    )
+
+for _count in (100, 1000):
+    CASES[f"cut_list[{3 * _count} rails]"] = partial(
+        cut_list, _random_rails(_count), 1500, 3
+    )
+
+
+def _clear_caches() -> None:
+    geometry_cache.clear()
+    profile_cache.clear()
+
+
+def run(
+    pattern: str = "",
+    repeat: int = 3,
+    budget: float = 10,
+) -> dict[str, dict[str, Any]]:
+    """Time each case whose name matches the pattern."""
+    disk_cache.directory = None
+    results = {}
+    for name, build in CASES.items():
+        if not re.search(pattern, name):
+            continue
+
+        times: list[float] = []
+        while len(times) < repeat and sum(times) < budget:
+            _clear_caches()
+            start = perf_counter()
+            build()
+            times.append(perf_counter() - start)
+
+        results[name] = {"min": min(times), "mean": mean(times), "runs": len(times)}
+        print(f"{name:<48} {min(times):>10.4f}s", flush=True)
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float = 1.2,
+) -> bool:
+    """Print the change in time of each case, and whether any regressed."""
+    regressed = False
+    print(f"\n{'case':<48} {'before':>10} {'after':>10} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["min"], result["min"]
+        ratio = after / before
+        flag = " !" if ratio > threshold else ""
+        regressed |= bool(flag)
+        print(f"{name:<48} {before:>10.4f} {after:>10.4f} {ratio:>7.2f}{flag}")
+    return regressed
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = ArgumentParser(description="Benchmark the construction of parts.")
+    parser.add_argument("-o", "--output", type=Path, help="JSON file to write")
+    parser.add_argument("-k", "--pattern", default="", help="regex of case names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=10, help="seconds per case")
+    parser.add_argument("--compare", type=Path, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.repeat, args.budget)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "commit": _commit(),
+                    "date": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "build123d": version("build123d"),
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        return int(compare(results, baseline, args.threshold))
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,97 @@
-from bd_vslot.bearings import *
-from bd_vslot.constants import *
-from bd_vslot.nuts import *
-from bd_vslot.plates import *
-from bd_vslot.rails import *
-from bd_vslot.wheels import *
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from bd_vslot.constants import ALUMINIUM_DENSITY, HOLE_TOLERANCE, BoltSize, Detail
+
+if TYPE_CHECKING:
+    from build123d import *
+
+    from bd_vslot.bearings import Bearing, Bearing105, Bearing625, Bearing688
+    from bd_vslot.nuts import VSlot2020SlidingTNut
+    from bd_vslot.plates import (
+        BuildPlate,
+        BuildPlateProfile,
+        LPlate,
+        VSlot2020EndCap,
+        VSlot2020EndCapProfile,
+    )
+    from bd_vslot.rails import (
+        LazyRail,
+        RailProfileSpec,
+        VSlot2020Rail,
+        VSlot2020RailProfile,
+    )
+    from bd_vslot.wheels import VSlot2020MiniWheel, VSlot2020Wheel, Wheel
+
+# Parts are imported from their modules on first access, so that importing
+# bd_vslot doesn't load build123d and NumPy until a part is needed.
+_LAZY_IMPORTS = {
+    "Bearing": "bd_vslot.bearings",
+    "Bearing625": "bd_vslot.bearings",
+    "Bearing688": "bd_vslot.bearings",
+    "Bearing105": "bd_vslot.bearings",
+    "VSlot2020SlidingTNut": "bd_vslot.nuts",
+    "VSlot2020EndCapProfile": "bd_vslot.plates",
+    "VSlot2020EndCap": "bd_vslot.plates",
+    "BuildPlateProfile": "bd_vslot.plates",
+    "BuildPlate": "bd_vslot.plates",
+    "LPlate": "bd_vslot.plates",
+    "RailProfileSpec": "bd_vslot.rails",
+    "VSlot2020RailProfile": "bd_vslot.rails",
+    "VSlot2020Rail": "bd_vslot.rails",
+    "LazyRail": "bd_vslot.rails",
+    "Wheel": "bd_vslot.wheels",
+    "VSlot2020Wheel": "bd_vslot.wheels",
+    "VSlot2020MiniWheel": "bd_vslot.wheels",
+}
+
+# The names of bd-vslot itself
+_PUBLIC = [
+    "ALUMINIUM_DENSITY",
+    "HOLE_TOLERANCE",
+    "BoltSize",
+    "Detail",
+    "Bearing",
+    "Bearing625",
+    "Bearing688",
+    "Bearing105",
+    "VSlot2020SlidingTNut",
+    "VSlot2020EndCapProfile",
+    "VSlot2020EndCap",
+    "BuildPlateProfile",
+    "BuildPlate",
+    "LPlate",
+    "RailProfileSpec",
+    "VSlot2020RailProfile",
+    "VSlot2020Rail",
+    "LazyRail",
+    "Wheel",
+    "VSlot2020Wheel",
+    "VSlot2020MiniWheel",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # For compatibility, bd_vslot also gives the names of build123d, which
+    # 'from bd_vslot import *' has always imported. They load build123d, so
+    # __all__ is only built when it is first needed.
+    if name == "__all__":
+        import build123d
+
+        value: Any = _PUBLIC + [n for n in build123d.__all__ if n not in _PUBLIC]
+    elif name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name]), name)
+    elif not name.startswith("_"):
+        import build123d
+
+        if name not in build123d.__all__:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(build123d, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_PUBLIC))
@@ -0,0 +1,5 @@
+import sys
+
+from bd_vslot.cli import main
+
+sys.exit(main())
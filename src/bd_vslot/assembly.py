@@ -0,0 +1,301 @@
+"""
+Assemblies of many repeated parts.
+
+An :class:`Assembly` builds one shape per unique part (class and arguments)
+and places every copy of it as an :class:`Instance` with its own location.
+Instances share the geometry of their shape, so a frame with hundreds of
+identical wheels or equal-length rails holds each solid in memory once, and
+its STEP and glTF exports write each solid once with references to it.
+
+.. code-block:: python
+
+    from build123d import Location
+
+    from bd_vslot import VSlot2020Rail, VSlot2020Wheel
+    from bd_vslot.assembly import Assembly
+
+    frame = Assembly("frame")
+    rail = frame.add(VSlot2020Rail, 500, label="post")
+    frame.attach("B", rail, "A", VSlot2020Rail, 250, label="beam")
+    for x in (-20, 20):
+        frame.add(VSlot2020Wheel, location=Location((x, 0, 100), (0, 90, 0)))
+
+    frame.export_step("frame.step")
+
+Many rails can be added at once from arrays of lengths and transformation
+matrices with :meth:`~bd_vslot.rails.VSlot2020Rail.many`.
+
+Instances are named by their labels, which also let an assembly be rebuilt
+incrementally. Re-running a script on the same assembly, or calling
+:meth:`Assembly.update`, only builds the parts whose arguments changed and
+moves the parts attached to them:
+
+.. code-block:: python
+
+    frame.update("post", 600)
+    frame.pop_changes()   # {"post", "beam"}
+
+Incremental rebuilds need every instance to be given a label. Instances
+without one get a new default label each time they are added, so
+re-running a script adds them again rather than replacing them.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterator
+from os import PathLike
+from typing import Any, NamedTuple, cast
+
+from build123d import *
+
+
+class Instance(NamedTuple):
+    """
+    A copy of one of an assembly's shapes, placed at a location.
+
+    :param label: Name of the instance in exported files.
+    :param shape: The shared shape, at its original location.
+    :param location: Location of the instance in the assembly.
+    """
+
+    label: str
+    shape: Part
+    location: Location
+
+    def part(self) -> Part:
+        """
+        Get the instance as a part at its location. The part shares its
+        geometry with the assembly's shape.
+        """
+        part = self.shape.moved(self.location)
+        part.label = self.label
+        return part
+
+    def joint_location(self, name: str) -> Location:
+        """Get the location of one of the shape's joints in the assembly."""
+        joint = cast(RigidJoint, self.shape.joints[name])
+        return self.location * joint.relative_location
+
+
+class _Inputs(NamedTuple):
+    """The inputs of an instance: its part and either a location or a joint."""
+
+    part_class: Callable[..., Part]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    location: Location
+    joint: tuple[str, str, str] | None = None  # (joint, to label, to joint)
+
+
+class Assembly:
+    """
+    A collection of part instances that share one shape per unique part.
+
+    Parts are given as a class (or any other callable that returns a part)
+    and its arguments, which must be hashable. Each unique combination is
+    built once, the first time it is added.
+
+    The inputs of every instance are recorded, so the assembly can be
+    updated in place. Adding an instance with the label of an existing one
+    replaces it, and changing an instance (see :meth:`update`) only builds
+    its new shape, if any, and moves the instances attached to it. This makes
+    it cheap to re-run a whole script after changing one of its parameters.
+
+    :param label: Name of the assembly in exported files.
+    """
+
+    def __init__(self, label: str = "assembly"):
+        self.label = label
+        self.shapes: dict[Hashable, Part] = {}
+        self.instances: dict[str, Instance] = {}
+        self.changed: set[str] = set()
+        self._inputs: dict[str, _Inputs] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._counts: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def __iter__(self) -> Iterator[Instance]:
+        return iter(self.instances.values())
+
+    def __getitem__(self, label: str) -> Instance:
+        return self.instances[label]
+
+    def shape(self, part_class: Callable[..., Part], *args: Any, **kwargs: Any) -> Part:
+        """Get the shared shape of a part, building it if it is new."""
+        key = (part_class, args, tuple(sorted(kwargs.items())))
+        if key not in self.shapes:
+            self.shapes[key] = part_class(*args, **kwargs)
+        return self.shapes[key]
+
+    def add(
+        self,
+        part_class: Callable[..., Part],
+        *args: Any,
+        location: Location | None = None,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> Instance:
+        """
+        Add an instance of a part at the given location.
+
+        :param part_class: The class of the part, such as VSlot2020Rail.
+        :param args: Positional arguments of the part.
+        :param location: Location of the instance. Default: the origin.
+        :param label: Name of the instance. An existing instance with the
+            same label is replaced. Default: the name of the part class
+            followed by a count, such as ``VSlot2020Rail-1``, which is new
+            each time, so give a label to update the instance by re-running
+            a script.
+        :param kwargs: Keyword arguments of the part.
+        """
+        inputs = _Inputs(part_class, args, kwargs, location or Location())
+        return self._place(label or self._label(part_class), inputs)
+
+    def attach(
+        self,
+        joint: str,
+        to: Instance,
+        to_joint: str,
+        part_class: Callable[..., Part],
+        *args: Any,
+        label: str | None = None,
+        **kwargs: Any,
+    ) -> Instance:
+        """
+        Add an instance of a part, placed by connecting one of its joints to
+        a joint of another instance. The placement is the same as that of
+        :meth:`build123d.RigidJoint.connect_to`, and it follows the other
+        instance when that instance changes.
+
+        :param joint: Name of the new part's joint.
+        :param to: The instance to attach the part to.
+        :param to_joint: Name of the other instance's joint.
+        :param part_class: The class of the part, such as VSlot2020Rail.
+        :param args: Positional arguments of the part.
+        :param label: Name of the instance. An existing instance with the
+            same label is replaced. Default: as for :meth:`add`.
+        :param kwargs: Keyword arguments of the part.
+        :raises ValueError: If the instance would be attached to itself or
+            to an instance that is attached to it.
+        """
+        inputs = _Inputs(
+            part_class, args, kwargs, Location(), (joint, to.label, to_joint)
+        )
+        return self._place(label or self._label(part_class), inputs)
+
+    def update(
+        self,
+        label: str,
+        *args: Any,
+        location: Location | None = None,
+        **kwargs: Any,
+    ) -> Instance:
+        """
+        Change the inputs of an instance and of everything attached to it.
+
+        :param label: Name of the instance.
+        :param args: New positional arguments of the part, which replace all
+            of the old ones. Default: unchanged.
+        :param location: New location of the instance. Default: unchanged.
+        :param kwargs: New keyword arguments of the part, which replace the
+            old ones of the same name.
+        """
+        inputs = self._inputs[label]
+        return self._place(
+            label,
+            inputs._replace(
+                args=args or inputs.args,
+                kwargs=inputs.kwargs | kwargs,
+                location=location or inputs.location,
+            ),
+        )
+
+    def pop_changes(self) -> set[str]:
+        """
+        Get the labels of the instances that were added, rebuilt or moved
+        since the last call, such as those that a preview needs to redraw.
+        """
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def prune(self) -> None:
+        """Forget the shapes that are no longer used by any instance."""
+        used = {id(instance.shape) for instance in self}
+        self.shapes = {k: v for k, v in self.shapes.items() if id(v) in used}
+
+    def _label(self, part_class: Callable[..., Part]) -> str:
+        """Get the next default label of an instance of a part class."""
+        name = getattr(part_class, "__name__", "Part")
+        self._counts[name] += 1
+        return f"{name}-{self._counts[name]}"
+
+    def _place(self, label: str, inputs: _Inputs) -> Instance:
+        """Record the inputs of an instance, then (re)build it."""
+        if inputs.joint is not None and self._depends_on(inputs.joint[1], label):
+            raise ValueError(
+                f"Can't attach {label!r} to {inputs.joint[1]!r}: the "
+                f"instances would be attached in a cycle"
+            )
+        if (old := self._inputs.get(label)) is not None and old.joint is not None:
+            self._dependents[old.joint[1]].discard(label)
+        if inputs.joint is not None:
+            self._dependents.setdefault(inputs.joint[1], set()).add(label)
+
+        self._inputs[label] = inputs
+        return self._refresh(label)
+
+    def _depends_on(self, label: str, other: str) -> bool:
+        """Check if an instance is, or is attached through others to, another."""
+        stack = [other]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current == label:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(self._dependents.get(current, ()))
+        return False
+
+    def _refresh(self, label: str) -> Instance:
+        """
+        Rebuild an instance from its inputs. If its shape or location has
+        changed, then rebuild the instances that are attached to it.
+        """
+        inputs = self._inputs[label]
+        shape = self.shape(inputs.part_class, *inputs.args, **inputs.kwargs)
+        location = inputs.location
+        if inputs.joint is not None:
+            joint, to, to_joint = inputs.joint
+            other = self.instances[to]
+            relative = other.shape.joints[to_joint].relative_to(shape.joints[joint])
+            location = other.location * relative
+
+        old = self.instances.get(label)
+        instance = Instance(label, shape, location)
+        self.instances[label] = instance
+
+        if old is None or old.shape is not shape or old.location != location:
+            self.changed.add(label)
+            for dependent in list(self._dependents.get(label, ())):
+                self._refresh(dependent)
+
+        return instance
+
+    def compound(self) -> Compound:
+        """
+        Get the assembly as a compound with one child part per instance.
+        The children share the geometry of the assembly's shapes.
+        """
+        compound = Compound(children=[instance.part() for instance in self])
+        compound.label = self.label
+        return compound
+
+    def export_step(self, path: str | PathLike) -> bool:
+        """Export the assembly as a STEP file, writing each shape once."""
+        return export_step(self.compound(), path)
+
+    def export_gltf(self, path: str | PathLike, binary: bool = True) -> bool:
+        """Export the assembly as a glTF file, writing each mesh once."""
+        return export_gltf(self.compound(), path, binary=binary)
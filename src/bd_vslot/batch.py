@@ -0,0 +1,201 @@
+import json
+import os
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from os import PathLike
+from pathlib import Path
+from time import perf_counter
+from typing import Any, NamedTuple, TypeVar
+
+from build123d import *
+
+import bd_vslot
+from bd_vslot import mesh
+
+T = TypeVar("T")
+
+
+# Functions used to export parts, by file extension
+EXPORTERS: dict[str, Callable[..., Any]] = {
+    "3mf": mesh.export_mesh_3mf,
+    "brep": export_brep,
+    "step": export_step,
+    "stl": mesh.export_mesh_stl,
+}
+
+
+class BuildResult(NamedTuple):
+    """The outcome of building and exporting a single part."""
+
+    name: str
+    paths: tuple[Path, ...]
+    seconds: float
+    error: str | None = None
+
+
+def read_config(path: str | PathLike) -> dict[str, dict[str, Any]]:
+    """
+    Read a YAML or JSON file that maps part class names to their parameters,
+    in the format of ``bd_vslot/config/parts.yaml``. Reading YAML requires
+    PyYAML.
+    """
+    with open(path) as f:
+        if Path(path).suffix == ".json":
+            return json.load(f)
+
+        import yaml
+
+        return yaml.safe_load(f)
+
+
+def part_class(name: str) -> type[BasePartObject | BaseSketchObject]:
+    """Return the bd-vslot part or profile class with the given name."""
+    cls = getattr(bd_vslot, name, None)
+    if not (
+        isinstance(cls, type) and issubclass(cls, BasePartObject | BaseSketchObject)
+    ):
+        raise ValueError(f"Unknown part: {name}")
+    return cls
+
+
+def build_part(
+    name: str,
+    params: Mapping[str, Any],
+    output: Path,
+    formats: tuple[str, ...] = ("stl",),
+    stem: str | None = None,
+) -> BuildResult:
+    """
+    Build a part and export it to the output directory in each format.
+
+    Exceptions are caught and reported in the result rather than raised.
+
+    :param name: The name of the part class.
+    :param params: The parameters of the part.
+    :param output: The directory to export the part to.
+    :param formats: File extensions to export the part as.
+    :param stem: The name of the exported files. Default: the class name.
+    """
+    stem = stem or name
+    start = perf_counter()
+    paths = []
+    try:
+        part = part_class(name)(**params)
+        for extension in formats:
+            path = output / f"{stem}.{extension}"
+            EXPORTERS[extension](part, str(path))
+            paths.append(path)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        return BuildResult(stem, tuple(paths), perf_counter() - start, error)
+
+    return BuildResult(stem, tuple(paths), perf_counter() - start)
+
+
+def iter_build_parts(
+    parts: Iterable[tuple[str, Mapping[str, Any]]],
+    output: str | PathLike,
+    formats: Iterable[str] = ("stl",),
+    workers: int | None = None,
+    chunksize: int = 1,
+    stems: Iterable[str] | None = None,
+) -> Iterator[BuildResult]:
+    """
+    Build and export a stream of parts across a pool of processes.
+
+    Parts are read from the iterable only as workers become free, and each
+    file is written as soon as its part is built, so memory use does not grow
+    with the number of parts. Repeated class names are exported as
+    ``name-1``, ``name-2``, etc.
+
+    :param parts: (class name, parameters) pairs.
+    :param stems: The name of the exported files of each part. Default: the
+        class name, numbered if repeated.
+    :return: The result for each part, in the order given.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    formats = tuple(formats)
+    for extension in formats:
+        if extension not in EXPORTERS:
+            raise ValueError(f"Unknown format: {extension}")
+
+    build = partial(_build_chunk, output=output, formats=formats)
+    items = (
+        _with_stems(parts)
+        if stems is None
+        else ((name, params, stem) for (name, params), stem in zip(parts, stems))
+    )
+    chunks = _chunks(items, chunksize)
+    if workers == 1:
+        for chunk in chunks:
+            yield from build(chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[list[BuildResult]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(build, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def build_parts(
+    parts: Mapping[str, Mapping[str, Any]],
+    output: str | PathLike,
+    formats: Iterable[str] = ("stl",),
+    workers: int | None = None,
+    chunksize: int = 1,
+) -> list[BuildResult]:
+    """
+    Build and export many parts in parallel across a pool of processes.
+
+    A part that fails to build does not abort the batch. Check the error
+    field of each result instead.
+
+    :param parts: A mapping of part class names to their parameters.
+    :param output: The directory to export the parts to.
+    :param formats: File extensions to export each part as. Options are
+        "3mf", "brep", "step" and "stl". Default: ("stl",).
+    :param workers: The number of processes. If 1, parts are built in this
+        process. Default: the number of CPUs.
+    :param chunksize: The number of parts sent to a process at a time.
+    :return: The result for each part, in the order given.
+    """
+    return list(iter_build_parts(parts.items(), output, formats, workers, chunksize))
+
+
+def _with_stems(
+    parts: Iterable[tuple[str, Mapping[str, Any]]],
+) -> Iterator[tuple[str, Mapping[str, Any], str]]:
+    """Add a unique file name to each (name, params) pair."""
+    counts: Counter[str] = Counter()
+    for name, params in parts:
+        count = counts[name]
+        counts[name] += 1
+        yield name, params, f"{name}-{count}" if count else name
+
+
+def _chunks(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Lazily split an iterable into lists of the given size."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _build_chunk(
+    chunk: list[tuple[str, Mapping[str, Any], str]],
+    output: Path,
+    formats: tuple[str, ...],
+) -> list[BuildResult]:
+    """Build a chunk of (name, params, stem) items. Used by the process pool."""
+    return [
+        build_part(name, params, output, formats, stem) for name, params, stem in chunk
+    ]
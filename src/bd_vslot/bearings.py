@@ -1,48 +1,79 @@
 from build123d import *
 
+from bd_vslot.cache import cached, geometry_cache
+from bd_vslot.constants import Detail
+from bd_vslot.mesh import MeshMixin
+from bd_vslot.profiling import profiled, stage
 from bd_vslot.utils.typing import Align3D
 
 
-class Bearing(BasePartObject):
+@cached(geometry_cache)
+def _bearing(
+    outer_diameter: float,
+    inner_diameter: float,
+    thickness: float,
+    detail: Detail,
+) -> Part:
+    """Build the geometry of a bearing with the given dimensions."""
+    outer_radius = outer_diameter / 2
+    inner_radius = inner_diameter / 2
+
+    if detail is not Detail.FULL:
+        with BuildPart() as bearing:
+            Cylinder(outer_radius, thickness)
+            if detail is Detail.SIMPLIFIED:
+                Hole(inner_radius)
+        return bearing.part
+
+    with stage("outer"), BuildPart() as outer:
+        Cylinder(outer_radius, thickness)
+        chamfer(outer.edges(), 0.2)
+        Hole(outer_radius - 1)
+    with stage("seal"), BuildPart() as seal:
+        Cylinder(outer_radius - 1, thickness - 0.2)
+        Hole(inner_radius + 1)
+        chamfer(seal.edges(), 0.2)
+    with stage("inner"), BuildPart() as inner:
+        Cylinder(inner_radius + 1, thickness)
+        Hole(inner_radius)
+        chamfer(inner.edges(select=Select.LAST), 0.2)
+    with stage("combine"), BuildPart() as bearing:
+        add(outer)
+        add(seal)
+        add(inner)
+
+    return bearing.part
+
+
+class Bearing(BasePartObject, MeshMixin):
     """
     Base class for creating bearings with specified dimensions.
 
+    The geometry is cached by dimensions, so creating many bearings of the
+    same size only builds the solid once (see :mod:`bd_vslot.cache`).
+
     :param outer_diameter: The outer diameter of the bearing.
     :param inner_diameter: The diameter of the center hole.
     :param thickness: Thickness in the axial direction.
+    :param detail: Level of detail of the geometry. SIMPLIFIED is a single
+        solid ring and ENVELOPE is a plain cylinder. Default: FULL.
     """
 
+    @profiled
     def __init__(
         self,
         outer_diameter: float,
         inner_diameter: float,
         thickness: float,
+        detail: Detail | str = Detail.FULL,
         *,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
     ):
-        outer_radius = outer_diameter / 2
-        inner_radius = inner_diameter / 2
-
-        with BuildPart() as outer:
-            Cylinder(outer_radius, thickness)
-            chamfer(outer.edges(), 0.2)
-            Hole(outer_radius - 1)
-        with BuildPart() as seal:
-            Cylinder(outer_radius - 1, thickness - 0.2)
-            Hole(inner_radius + 1)
-            chamfer(seal.edges(), 0.2)
-        with BuildPart() as inner:
-            Cylinder(inner_radius + 1, thickness)
-            Hole(inner_radius)
-            chamfer(inner.edges(select=Select.LAST), 0.2)
-        with BuildPart() as bearing:
-            add(outer)
-            add(seal)
-            add(inner)
-
-        super().__init__(bearing.part, rotation, align, mode)
+        part = _bearing(outer_diameter, inner_diameter, thickness, Detail(detail))
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
 
 
 class Bearing625(Bearing):
@@ -55,6 +86,7 @@ class Bearing625(Bearing):
     def __init__(
         self,
         *,
+        detail: Detail | str = Detail.FULL,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
@@ -63,6 +95,7 @@ class Bearing625(Bearing):
             outer_diameter=16,
             inner_diameter=5,
             thickness=5,
+            detail=detail,
             rotation=rotation,
             align=align,
             mode=mode,
@@ -79,6 +112,7 @@ class Bearing688(Bearing):
     def __init__(
         self,
         *,
+        detail: Detail | str = Detail.FULL,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
@@ -87,6 +121,7 @@ class Bearing688(Bearing):
             outer_diameter=16,
             inner_diameter=8,
             thickness=5,
+            detail=detail,
             rotation=rotation,
             align=align,
             mode=mode,
@@ -103,6 +138,7 @@ class Bearing105(Bearing):
     def __init__(
         self,
         *,
+        detail: Detail | str = Detail.FULL,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
@@ -111,6 +147,7 @@ class Bearing105(Bearing):
             outer_diameter=10,
             inner_diameter=5,
             thickness=4,
+            detail=detail,
             rotation=rotation,
             align=align,
             mode=mode,
@@ -0,0 +1,274 @@
+import copy
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from functools import cache, wraps
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from threading import Lock
+from typing import Any, NamedTuple, ParamSpec, TypeVar
+
+from build123d import Part, export_brep, import_brep
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    """Hit and miss statistics for a cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe, least-recently-used cache.
+
+    :param maxsize: The maximum number of entries to keep. It can be changed
+        at any time, which drops the least recently used entries at once if
+        there are now too many.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        """The maximum number of entries to keep."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    def _trim(self) -> None:
+        """Drop the least recently used entries until there are few enough."""
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return the value stored under key, calling build on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._misses += 1
+
+        value = build()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._trim()
+
+        return value
+
+    def info(self) -> CacheInfo:
+        """Return the hit and miss statistics of the cache."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+@cache
+def _version(package: str) -> str:
+    """Return the installed version of a package or "unknown"."""
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class DiskCache:
+    """
+    A persistent, size-bounded cache of solids stored as BREP files.
+
+    Entries are keyed by a hash of the key and the versions of bd-vslot and
+    build123d, so upgrading either library invalidates old entries. Files are
+    written atomically and evicted in least-recently-used order, which makes
+    it safe for several processes to share one directory. The cache is
+    disabled while directory is None.
+
+    :param directory: The directory to store BREP files in, or None.
+    :param max_bytes: The maximum total size of the stored files.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike | None = None,
+        max_bytes: int = 2**30,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _path(self, key: Hashable) -> Path:
+        """Return the path of the file that stores the given key."""
+        assert self.directory is not None
+        versions = (_version("bd-vslot"), _version("build123d"))
+        digest = hashlib.sha256(repr((key, versions)).encode()).hexdigest()
+        return Path(self.directory).expanduser() / f"{digest}.brep"
+
+    def _files(self) -> list[tuple[Path, os.stat_result]]:
+        """Return the stored files with their stats, skipping removed ones."""
+        assert self.directory is not None
+        files = []
+        for path in Path(self.directory).expanduser().glob("*.brep"):
+            try:
+                files.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        return files
+
+    def _load(self, path: Path) -> Part | None:
+        """Load a stored solid, or return None if it is missing."""
+        if not path.is_file():
+            return None
+        try:
+            shape = import_brep(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return Part(shape.wrapped)
+
+    def _store(self, path: Path, part: Part) -> None:
+        """Atomically write a solid to the given path and evict old files."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            export_brep(part, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until the size is in bounds."""
+        files = sorted(self._files(), key=lambda file: file[1].st_mtime)
+        size = sum(stat.st_size for _, stat in files)
+        for path, stat in files:
+            if size <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= stat.st_size
+
+    def get(self, key: Hashable, build: Callable[[], Part]) -> Part:
+        """Return the solid stored under key, calling build on a miss."""
+        if self.directory is None:
+            return build()
+
+        path = self._path(key)
+        part = self._load(path)
+        with self._lock:
+            if part is not None:
+                self._hits += 1
+                return part
+            self._misses += 1
+
+        part = build()
+        self._store(path, part)
+        return part
+
+    def info(self) -> CacheInfo:
+        """
+        Return the hit and miss statistics of this process. The maxsize and
+        currsize fields are measured in bytes.
+        """
+        currsize = 0
+        if self.directory is not None:
+            currsize = sum(stat.st_size for _, stat in self._files())
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.max_bytes, currsize)
+
+    def clear(self) -> None:
+        """Remove all stored files and reset the statistics."""
+        if self.directory is not None:
+            for path, _ in self._files():
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+# Geometry of parts with fixed dimensions (bearings, wheels, nuts, etc.)
+geometry_cache = LRUCache(maxsize=256)
+
+# Rail and plate profile sketches, keyed by their dimensions
+profile_cache = LRUCache(maxsize=64)
+
+# Solids of lazy rails, built on first use, keyed by their dimensions
+rail_cache = LRUCache(maxsize=32)
+
+# Triangle meshes of solids, keyed by their geometry and tolerances
+mesh_cache = LRUCache(maxsize=256)
+
+# Opt-in persistent geometry of parameterized parts (rails, plates, etc.)
+disk_cache = DiskCache(os.environ.get("BD_VSLOT_CACHE_DIR"))
+
+
+def cached(cache: LRUCache) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """
+    Memoize a function that builds a shape in the given cache.
+
+    The cache key is made from the function name and its arguments, which
+    must be hashable. Each call returns a copy of the cached shape that shares
+    the underlying geometry, so that it can be moved without affecting the
+    cache.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            return copy.copy(cache.get(key, lambda: func(*args, **kwargs)))
+
+        return wrapper
+
+    return decorator
+
+
+def disk_cached(cache: DiskCache) -> Callable[[Callable[P, Part]], Callable[P, Part]]:
+    """
+    Persist the solids built by a function in the given disk cache.
+
+    The cache key is made from the function name and its arguments, which
+    must have a stable repr. Each call returns a newly loaded solid.
+    """
+
+    def decorator(func: Callable[P, Part]) -> Callable[P, Part]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> Part:
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            return cache.get(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
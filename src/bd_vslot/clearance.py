@@ -0,0 +1,312 @@
+"""
+Clearance checks between the parts of a frame.
+
+:func:`find_clashes` finds the parts of an :class:`~bd_vslot.assembly.Assembly`
+(or any list of parts) that interfere with each other, or that are closer
+than a given clearance:
+
+.. code-block:: python
+
+    from bd_vslot.clearance import find_clashes
+
+    for clash in find_clashes(frame, clearance=0.5):
+        print(clash.first, clash.second, clash.distance, clash.interference)
+
+Checking every pair of parts with an OCCT boolean is quadratic and takes
+minutes for a frame of a few hundred parts, so the check runs in three
+stages, each of which only passes on the pairs it can't settle:
+
+1. A broad phase compares the bounding boxes of every part at once, by sweep
+   and prune, and drops the pairs whose boxes are apart.
+2. A narrow phase compares pairs of axis-aligned rails cell by cell, using
+   their profiles. Rails whose cells are apart are clear, and rails whose
+   solid cores overlap interfere, without building any geometry.
+3. The remaining pairs are checked exactly with OCCT.
+
+Rails that touch, such as the end of one rail butted against the side of
+another, don't interfere. They only clash if a clearance is given.
+"""
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+from build123d import *
+from numpy.typing import ArrayLike
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Common  # type: ignore[import-untyped]
+from OCP.BRepExtrema import BRepExtrema_DistShapeShape  # type: ignore[import-untyped]
+from OCP.BRepGProp import BRepGProp  # type: ignore[import-untyped]
+from OCP.GProp import GProp_GProps  # type: ignore[import-untyped]
+from OCP.TopoDS import TopoDS_Shape  # type: ignore[import-untyped]
+
+from bd_vslot.assembly import Assembly, Instance
+from bd_vslot.constants import Detail
+from bd_vslot.profiling import stage
+from bd_vslot.rails import _HOLE_RADIUS, RailProfileSpec
+
+# The part of each exposed cell of a full-detail rail profile that is always
+# solid: the square around the center hole, inside the slots and cavities.
+# It is split into four boxes that frame the hole, and reaches just short of
+# the nearest corner of any slot or cavity, at (3.37, 3.37).
+_CORE = 3.3
+_CORE_BOXES = np.array(
+    [
+        ((_HOLE_RADIUS, -_CORE), (_CORE, _CORE)),
+        ((-_CORE, -_CORE), (-_HOLE_RADIUS, _CORE)),
+        ((-_HOLE_RADIUS, _HOLE_RADIUS), (_HOLE_RADIUS, _CORE)),
+        ((-_HOLE_RADIUS, -_CORE), (_HOLE_RADIUS, -_HOLE_RADIUS)),
+    ]
+)
+
+
+class Clash(NamedTuple):
+    """
+    Two parts that interfere, or that are closer than the clearance.
+
+    :param first: Label of the first part.
+    :param second: Label of the second part.
+    :param distance: The shortest distance between the parts, which is 0 if
+        they touch or interfere.
+    :param interference: Whether the parts overlap, rather than only being
+        too close.
+    """
+
+    first: str
+    second: str
+    distance: float
+    interference: bool
+
+
+def box_pairs(lower: ArrayLike, upper: ArrayLike) -> np.ndarray:
+    """
+    Find every pair of overlapping axis-aligned boxes, by sweep and prune
+    along the axis over which the boxes are most spread out. Boxes that
+    touch are overlapping.
+
+    :param lower: The (n, 3) minimum corners of the boxes.
+    :param upper: The (n, 3) maximum corners of the boxes.
+    :return: The (k, 2) indices of each pair, with the lower index first,
+        in sorted order.
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    n = len(lower)
+    axis = int(np.argmax(np.ptp(lower + upper, axis=0))) if n else 0
+
+    # After sorting by the start of each box along the axis, each box can
+    # only overlap the boxes that start after it and before its end
+    order = np.argsort(lower[:, axis], kind="stable")
+    lower, upper = lower[order], upper[order]
+    end = np.searchsorted(lower[:, axis], upper[:, axis], side="right")
+    counts = np.maximum(end - np.arange(n) - 1, 0)
+    i = np.repeat(np.arange(n), counts)
+    j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + i + 1
+
+    overlap = np.all((lower[j] <= upper[i]) & (lower[i] <= upper[j]), axis=1)
+    pairs = np.sort(order[np.column_stack((i[overlap], j[overlap]))], axis=1)
+    return pairs[np.lexsort(pairs.T[::-1])] if len(pairs) else pairs.reshape(0, 2)
+
+
+def _matrix(location: Location) -> np.ndarray:
+    """Get the 3x4 matrix of a location."""
+    transformation = location.wrapped.Transformation()
+    return np.array(
+        [[transformation.Value(i, j) for j in range(1, 5)] for i in range(1, 4)]
+    )
+
+
+def _transform_boxes(boxes: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Get the (n, 2, 3) world bounds of boxes given in a local frame, which are
+    exact if the frame is axis-aligned.
+    """
+    corners = np.stack(
+        [
+            np.stack([boxes[:, x, 0], boxes[:, y, 1], boxes[:, z, 2]], axis=-1)
+            for x in (0, 1)
+            for y in (0, 1)
+            for z in (0, 1)
+        ],
+        axis=1,
+    )
+    corners = corners @ matrix[:, :3].T + matrix[:, 3]
+    return np.stack([corners.min(axis=1), corners.max(axis=1)], axis=1)
+
+
+def _rail_boxes(shape: Part) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Get the (n, 2, 3) boxes of the cells of a rail, in the frame that it was
+    built in, and the boxes that are always solid, or None if the shape isn't
+    a rail.
+    """
+    spec: RailProfileSpec | None = getattr(shape, "profile_spec", None)
+    if spec is None:
+        return None
+    length: float = getattr(shape, "length")
+    detail: Detail = getattr(shape, "detail")
+
+    array = spec.to_array()
+    if detail is Detail.ENVELOPE:
+        array = np.ones_like(array)
+    cells = np.argwhere(array)
+    centers = np.column_stack((20 * cells, np.zeros(len(cells))))
+    half = np.array([10, 10, 0])
+    top = np.array([0, 0, length])
+    envelope = np.stack([centers - half, centers + half + top], axis=1)
+    if detail is not Detail.FULL:
+        return envelope, envelope
+
+    # Interior cells are hollow, and only the core of each exposed cell is
+    # always solid
+    padded = np.pad(array, 1)
+    interior = (
+        padded[2:, 1:-1] & padded[:-2, 1:-1] & padded[1:-1, 2:] & padded[1:-1, :-2]
+    )
+    exposed = centers[~interior[array]]
+    core = np.concatenate([_CORE_BOXES, np.zeros((4, 2, 1))], axis=2)
+    core[:, 1, 2] = length
+    solid = (exposed[:, None, None] + core[None]).reshape(-1, 2, 3)
+    return envelope, solid
+
+
+def _axis_aligned(matrix: np.ndarray) -> bool:
+    """Check if a matrix only rotates by multiples of 90 degrees."""
+    rotation = np.abs(matrix[:, :3])
+    return bool(np.allclose(rotation, np.round(rotation), atol=1e-9))
+
+
+def _box_depths(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Get how deep each box of one set overlaps each box of another, which is
+    negative for boxes that are apart.
+    """
+    overlap = np.minimum(a[:, None, 1], b[None, :, 1]) - np.maximum(
+        a[:, None, 0], b[None, :, 0]
+    )
+    return overlap.min(axis=-1)
+
+
+def _box_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Get the distance between each box of one set and each box of another."""
+    gaps = np.maximum(
+        np.maximum(b[None, :, 0] - a[:, None, 1], a[:, None, 0] - b[None, :, 1]), 0
+    )
+    return np.linalg.norm(gaps, axis=-1)
+
+
+def _volume(shape: TopoDS_Shape) -> float:
+    """Get the volume of a shape."""
+    properties = GProp_GProps()
+    BRepGProp.VolumeProperties_s(shape, properties)
+    return properties.Mass()
+
+
+def _exact(
+    a: TopoDS_Shape, b: TopoDS_Shape, clearance: float, tolerance: float
+) -> tuple[float, bool] | None:
+    """
+    Check two shapes with OCCT, returning their distance and whether they
+    interfere if they clash.
+    """
+    common = BRepAlgoAPI_Common(a, b)
+    if common.IsDone() and _volume(common.Shape()) > tolerance:
+        return 0.0, True
+    if clearance <= 0:
+        return None
+    distance = BRepExtrema_DistShapeShape(a, b).Value()
+    return (distance, False) if distance < clearance else None
+
+
+def find_clashes(
+    parts: Assembly | Iterable[Part],
+    clearance: float = 0,
+    tolerance: float = 1e-6,
+) -> list[Clash]:
+    """
+    Find the pairs of parts that interfere, or that are closer than the
+    clearance.
+
+    :param parts: An assembly, or parts at their locations. Parts are named
+        by their label, or their index if they have none.
+    :param clearance: The least distance allowed between parts that don't
+        touch. If 0, parts that touch are allowed.
+    :param tolerance: Overlaps smaller than this, in millimeters (or cubic
+        millimeters for volumes), are ignored.
+    :return: The clashes, in the order that the parts were given.
+    """
+    if isinstance(parts, Assembly):
+        instances = list(parts)
+    else:
+        instances = [
+            Instance(part.label or str(i), part, Location())
+            for i, part in enumerate(parts)
+        ]
+
+    with stage("broad"):
+        # Shared shapes are only measured once, then moved to each location
+        bounds: dict[int, np.ndarray] = {}
+        rails: dict[int, tuple[np.ndarray, np.ndarray] | None] = {}
+        for instance in instances:
+            key = id(instance.shape)
+            if key not in bounds:
+                box = instance.shape.bounding_box()
+                bounds[key] = np.array([tuple(box.min), tuple(box.max)])
+                rails[key] = _rail_boxes(instance.shape)
+
+        matrices = [_matrix(instance.location) for instance in instances]
+        boxes = np.concatenate(
+            [
+                _transform_boxes(bounds[id(instance.shape)][None], matrix)
+                for instance, matrix in zip(instances, matrices)
+            ]
+        ).reshape(-1, 2, 3)
+        margin = clearance / 2 + tolerance
+        pairs = box_pairs(boxes[:, 0] - margin, boxes[:, 1] + margin)
+
+    with stage("narrow"):
+        # The cells of each axis-aligned rail, in world coordinates
+        cells: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        for index in np.unique(pairs):
+            instance = instances[index]
+            rail = rails[id(instance.shape)]
+            if rail is None:
+                continue
+            matrix = _matrix(instance.location * instance.shape.location)
+            if not _axis_aligned(matrix):
+                continue
+            envelope, solid = (_transform_boxes(b, matrix) for b in rail)
+            # Skip shapes that have been changed since they were built
+            extent = np.array([envelope[:, 0].min(axis=0), envelope[:, 1].max(axis=0)])
+            if np.allclose(extent, boxes[index], atol=1e-3):
+                cells[index] = envelope, solid
+
+        clashes: dict[tuple[int, int], Clash] = {}
+        remaining = []
+        for i, j in pairs.tolist():
+            if i not in cells or j not in cells:
+                remaining.append((i, j))
+                continue
+            (envelope_i, solid_i), (envelope_j, solid_j) = cells[i], cells[j]
+            if (_box_depths(envelope_i, envelope_j) <= tolerance).all() and (
+                _box_distances(envelope_i, envelope_j) >= clearance
+            ).all():
+                continue
+            if (_box_depths(solid_i, solid_j) > tolerance).any():
+                clashes[i, j] = Clash(instances[i].label, instances[j].label, 0.0, True)
+            else:
+                remaining.append((i, j))
+
+    with stage("exact"):
+        shapes: dict[int, TopoDS_Shape] = {}
+        for i, j in remaining:
+            for index in (i, j):
+                if index not in shapes:
+                    instance = instances[index]
+                    shapes[index] = instance.shape.wrapped.Moved(
+                        instance.location.wrapped
+                    )
+            result = _exact(shapes[i], shapes[j], clearance, tolerance)
+            if result is not None:
+                clashes[i, j] = Clash(instances[i].label, instances[j].label, *result)
+
+    return [clashes[pair] for pair in sorted(clashes)]
@@ -0,0 +1,92 @@
+import json
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+# The formats of bd_vslot.batch.EXPORTERS. The batch module loads build123d,
+# so it is only imported once the arguments are parsed, to keep --help fast.
+FORMATS = ("3mf", "brep", "step", "stl")
+
+
+def read_ndjson(
+    lines: Iterable[str],
+    on_error: Callable[[int, str], None] | None = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Lazily read (class name, parameters) pairs from newline-delimited JSON.
+
+    Each line is an object in the format of ``bd_vslot/config/parts.yaml``,
+    for example ``{"VSlot2020Rail": {"length": 100}}``. Blank lines are
+    skipped.
+
+    :param lines: The lines to read.
+    :param on_error: Called with the line number and the error of each line
+        that isn't a JSON object, which is then skipped. Default: raise a
+        ValueError.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            parts = json.loads(line)
+            if not isinstance(parts, dict):
+                raise ValueError(f"Expected an object, not {type(parts).__name__}")
+        except ValueError as e:  # Including json.JSONDecodeError
+            if on_error is None:
+                raise
+            on_error(number, f"{type(e).__name__}: {e}")
+            continue
+        yield from parts.items()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Build and export the parts of a config file or NDJSON stream."""
+    parser = ArgumentParser(prog="bd-vslot", description=main.__doc__)
+    parser.add_argument(
+        "config",
+        nargs="?",
+        default="-",
+        help="YAML or JSON parts file, or - to read NDJSON from stdin",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("."))
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="formats",
+        nargs="+",
+        choices=FORMATS,
+        default=["stl"],
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    from bd_vslot.batch import iter_build_parts, read_config
+
+    failures = 0
+
+    def bad_line(number: int, error: str) -> None:
+        nonlocal failures
+        print(f"line {number}\t0.000s\t{error}", file=sys.stderr, flush=True)
+        failures += 1
+
+    if args.config == "-":
+        parts: Iterable[tuple[str, Any]] = read_ndjson(sys.stdin, bad_line)
+    else:
+        parts = read_config(args.config).items()
+
+    for result in iter_build_parts(
+        parts, args.output, args.formats, args.workers, args.chunksize
+    ):
+        if result.error is None:
+            files = " ".join(path.name for path in result.paths)
+            print(f"{result.name}\t{result.seconds:.3f}s\t{files}", flush=True)
+        else:
+            print(
+                f"{result.name}\t{result.seconds:.3f}s\t{result.error}", file=sys.stderr
+            )
+            failures += 1
+
+    return 1 if failures else 0
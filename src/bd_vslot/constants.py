@@ -2,6 +2,9 @@ from enum import Enum
 
 HOLE_TOLERANCE = 0.05
 
+# Density of 6063 aluminium in grams per cubic millimeter
+ALUMINIUM_DENSITY = 2.7e-3
+
 
 class BoltSize(Enum):
     """Standard bolt sizes and their radii in millimeters."""
@@ -10,3 +13,17 @@ class BoltSize(Enum):
     M4 = 2.0
     M5 = 2.5
     M6 = 3.0
+
+
+class Detail(Enum):
+    """
+    Levels of detail of the geometry of a part.
+
+    FULL is the real part. SIMPLIFIED keeps the overall shape of the part but
+    drops its slots, chamfers and small holes. ENVELOPE is the plain solid
+    that bounds the part. Every level has the same envelope and joints.
+    """
+
+    FULL = "full"
+    SIMPLIFIED = "simplified"
+    ENVELOPE = "envelope"
@@ -0,0 +1,249 @@
+"""
+Cut lists for ordering and building rails.
+
+A machine needs many rails of a few profiles and many lengths. A cut list
+packs them onto bars of stock, allowing for the width of each saw cut (the
+kerf), so that as few bars as possible are ordered:
+
+.. code-block:: python
+
+    from bd_vslot.cutlist import Rail, cut_list, export_rails
+    from bd_vslot.rails import RailProfileSpec
+
+    rails = [
+        Rail(500, quantity=4),
+        Rail(340, quantity=8),
+        Rail(500, 2, 1, 2),
+        Rail(250, profile_spec=RailProfileSpec.from_array([[1, 1], [1, 0]])),
+    ]
+    for bar in cut_list(rails, stock_length=1500, kerf=3):
+        print(bar.profile, bar.cuts, bar.offcut)
+
+    export_rails(rails, "output", formats=("stl", "step"))
+
+Rails are packed with the best-fit decreasing heuristic, which handles
+thousands of rails in a fraction of a second and is close to optimal for
+large sets. Small sets can be solved exactly instead. Rails whose profiles are
+rotations or mirror images of each other are cut from the same bars. Each
+unique rail is only built once when exporting, however many of it are needed.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from collections.abc import Iterable
+from math import ceil
+from os import PathLike
+from typing import Any, NamedTuple
+
+from bd_vslot.batch import BuildResult, iter_build_parts
+from bd_vslot.rails import RailProfileSpec, _rail_spec
+
+# The most rails of one profile that the exact solver will attempt
+EXACT_MAX_RAILS = 16
+
+# Tolerance when comparing lengths
+_EPSILON = 1e-9
+
+
+class Rail(NamedTuple):
+    """
+    A number of rails of the same length and profile. The profile is given
+    as in :class:`~bd_vslot.rails.VSlot2020Rail`.
+
+    :param length: Length of the rails.
+    :param quantity: Number of rails.
+    :param num_x_rails: Number of rails along the X-axis.
+    :param num_y_rails: Number of rails along the Y-axis.
+    :param c_beam: Whether the rails have a C-beam profile.
+    :param profile_spec: The profile of the rails, instead of
+        ``num_x_rails``, ``num_y_rails`` and ``c_beam``.
+    """
+
+    length: float
+    quantity: int = 1
+    num_x_rails: int = 1
+    num_y_rails: int = 1
+    c_beam: bool = False
+    profile_spec: RailProfileSpec | None = None
+
+    @property
+    def profile(self) -> RailProfileSpec:
+        """The spec of the profile of the rails."""
+        return self.profile_spec or _rail_spec(
+            self.num_x_rails, self.num_y_rails, self.c_beam
+        )
+
+    def params(self) -> dict[str, Any]:
+        """Get the parameters of a single rail, for VSlot2020Rail."""
+        return {"length": self.length, "profile": self.profile}
+
+
+class Bar(NamedTuple):
+    """
+    A bar of stock and the rails to cut from it.
+
+    :param profile: The canonical spec of the profile of the bar (see
+        :meth:`~bd_vslot.rails.RailProfileSpec.canonical`).
+    :param cuts: The lengths of the rails, longest first.
+    :param offcut: The length left over after cutting the rails.
+    """
+
+    profile: RailProfileSpec
+    cuts: tuple[float, ...]
+    offcut: float
+
+
+def unique_rails(rails: Iterable[Rail]) -> list[Rail]:
+    """
+    Combine rails of the same length and profile, summing their quantity.
+    Each combined rail is the first of its kind.
+    """
+    first: dict[tuple[float, RailProfileSpec], Rail] = {}
+    quantities: dict[tuple[float, RailProfileSpec], int] = defaultdict(int)
+    for rail in rails:
+        key = rail.length, rail.profile
+        first.setdefault(key, rail)
+        quantities[key] += rail.quantity
+    return [first[key]._replace(quantity=n) for key, n in quantities.items()]
+
+
+def cut_list(
+    rails: Iterable[Rail],
+    stock_length: float,
+    kerf: float = 0,
+    exact: bool = False,
+) -> list[Bar]:
+    """
+    Pack rails onto as few bars of stock as possible.
+
+    :param rails: The rails to cut.
+    :param stock_length: Length of the bars of stock.
+    :param kerf: Width of material lost to each cut.
+    :param exact: Find the fewest bars for each profile with at most
+        :data:`EXACT_MAX_RAILS` rails by searching, rather than with the
+        heuristic. Larger profiles always use the heuristic.
+    :return: The bars of each profile, in the order the profiles were given.
+    """
+    lengths: dict[RailProfileSpec, list[float]] = defaultdict(list)
+    for rail in rails:
+        if rail.length > stock_length + _EPSILON:
+            raise ValueError(
+                f"Rail of length {rail.length} is longer than the stock "
+                f"length {stock_length}"
+            )
+        lengths[rail.profile.canonical()] += [rail.length] * rail.quantity
+
+    # Each rail uses its length plus a cut, except that the last rail on a
+    # bar needs no cut if it reaches the end. Adding a cut to the capacity of
+    # the bar accounts for both.
+    capacity = stock_length + kerf
+    bars = []
+    for profile, pieces in lengths.items():
+        pieces.sort(reverse=True)
+        packed = _best_fit(pieces, capacity, kerf)
+        if exact and len(pieces) <= EXACT_MAX_RAILS:
+            packed = _exact(pieces, capacity, kerf, packed)
+        for cuts in packed:
+            offcut = stock_length - sum(cuts) - kerf * len(cuts)
+            bars.append(Bar(profile, tuple(cuts), max(offcut, 0)))
+    return bars
+
+
+def _best_fit(pieces: list[float], capacity: float, kerf: float) -> list[list[float]]:
+    """
+    Pack pieces, longest first, each into the bar that it leaves the
+    smallest gap in.
+    """
+    bars: list[list[float]] = []
+    gaps: list[tuple[float, int]] = []  # (remaining length, bar), sorted
+    for piece in pieces:
+        need = piece + kerf
+        i = bisect_left(gaps, (need - _EPSILON, -1))
+        if i < len(gaps):
+            gap, bar = gaps.pop(i)
+            bars[bar].append(piece)
+        else:
+            gap, bar = capacity, len(bars)
+            bars.append([piece])
+        insort(gaps, (gap - need, bar))
+    return bars
+
+
+def _exact(
+    pieces: list[float],
+    capacity: float,
+    kerf: float,
+    best: list[list[float]],
+) -> list[list[float]]:
+    """
+    Search for a packing of pieces, longest first, into fewer bars than the
+    best one known.
+    """
+    needs = [piece + kerf for piece in pieces]
+    lower = ceil(sum(needs) / capacity - _EPSILON)
+
+    for num_bars in range(lower, len(best)):
+        bars: list[list[float]] = [[] for _ in range(num_bars)]
+        gaps = [capacity] * num_bars
+
+        def place(i: int) -> bool:
+            if i == len(pieces):
+                return True
+            if sum(needs[i:]) > sum(gaps) + _EPSILON:
+                return False
+            tried = set()
+            for bar, gap in enumerate(gaps):
+                # Bars with the same gap are interchangeable
+                if gap < needs[i] - _EPSILON or gap in tried:
+                    continue
+                tried.add(gap)
+                gaps[bar] -= needs[i]
+                bars[bar].append(pieces[i])
+                if place(i + 1):
+                    return True
+                gaps[bar] += needs[i]
+                bars[bar].pop()
+            return False
+
+        if place(0):
+            return [cuts for cuts in bars if cuts]
+    return best
+
+
+def export_rails(
+    rails: Iterable[Rail],
+    output: str | PathLike,
+    formats: Iterable[str] = ("stl",),
+    workers: int | None = None,
+) -> dict[Rail, BuildResult]:
+    """
+    Build and export each unique rail once, across a pool of processes.
+    See :func:`bd_vslot.batch.iter_build_parts`.
+
+    Each file is named after the profile and length of its rail, such as
+    ``VSlot2020Rail-2x1-1250.stl``, so that it can be matched to the cut
+    list. Profiles are named by their size, and C-beams as ``c-beam-4x2``.
+    Any other profile is followed by its cells as a hex number (see
+    :class:`~bd_vslot.rails.RailProfileSpec`).
+
+    :return: The result of each unique rail, with its total quantity.
+    """
+    unique = unique_rails(rails)
+    parts = (("VSlot2020Rail", rail.params()) for rail in unique)
+    stems = (
+        f"VSlot2020Rail-{_profile_name(rail.profile)}-{rail.length:g}"
+        for rail in unique
+    )
+    return dict(
+        zip(unique, iter_build_parts(parts, output, formats, workers, stems=stems))
+    )
+
+
+def _profile_name(spec: RailProfileSpec) -> str:
+    """Get a short name of a profile that is unique to it."""
+    x, y = spec.shape
+    if spec == RailProfileSpec.box(x, y):
+        return f"{x}x{y}"
+    if spec == RailProfileSpec.c_beam(x, y):
+        return f"c-beam-{x}x{y}"
+    return f"{x}x{y}-{spec.bits:x}"
@@ -0,0 +1,361 @@
+"""
+Cached tessellation and fast mesh export.
+
+Shapes are tessellated once per solid and tolerance, and the triangle meshes
+are kept as NumPy arrays in :data:`bd_vslot.cache.mesh_cache`. Meshes are
+stored in the solid's own coordinates, so every copy of a solid that shares
+its geometry (such as the parts of an :class:`~bd_vslot.assembly.Assembly`
+or repeated bearings and wheels) reuses the same mesh at its own location.
+Exporting the same part again skips meshing entirely. The faces of each mesh
+share the vertices along their edges, so the meshes of solids are closed, as
+STL and 3MF consumers expect.
+
+.. code-block:: python
+
+    from bd_vslot import VSlot2020Rail
+    from bd_vslot.mesh import export_mesh_stl, tessellate
+
+    rail = VSlot2020Rail(500)
+    export_mesh_stl(rail, "rail.stl")
+    export_mesh_stl(rail, "preview.stl")   # reuses the mesh of the first export
+
+    vertices, triangles = rail.mesh_arrays()   # float32 and uint32 arrays
+
+The arrays are contiguous, so they can be handed to rendering or collision
+code through the buffer protocol (``memoryview(vertices)``) without any
+per-vertex Python objects. A part at its original location gets the cached
+arrays themselves, which are read-only. Meshes can also be saved to disk and
+mapped back into memory:
+
+.. code-block:: python
+
+    vertices, triangles = rail.mesh_arrays(path="meshes/rail")
+"""
+
+import zipfile
+from os import PathLike
+from pathlib import Path
+from typing import Literal, NamedTuple, cast
+
+import numpy as np
+from build123d.topology import Shape
+from OCP.BRep import BRep_Tool  # type: ignore[import-untyped]
+from OCP.BRepMesh import BRepMesh_IncrementalMesh  # type: ignore[import-untyped]
+from OCP.TopAbs import (  # type: ignore[import-untyped]
+    TopAbs_COMPOUND,
+    TopAbs_FACE,
+    TopAbs_REVERSED,
+)
+from OCP.TopExp import TopExp_Explorer  # type: ignore[import-untyped]
+from OCP.TopLoc import TopLoc_Location  # type: ignore[import-untyped]
+from OCP.TopoDS import (  # type: ignore[import-untyped]
+    TopoDS,
+    TopoDS_Iterator,
+    TopoDS_Shape,
+)
+
+from bd_vslot.cache import mesh_cache
+
+
+class Mesh(NamedTuple):
+    """
+    A triangle mesh as a pair of contiguous NumPy arrays, which can be passed
+    to any consumer of the buffer protocol without copying.
+
+    :param vertices: Array of shape (N, 3) and type float32 of vertex
+        coordinates.
+    :param triangles: Array of shape (M, 3) and type uint32 of vertex indices,
+        ordered counter-clockwise when seen from outside.
+    """
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+
+    def __repr__(self) -> str:
+        return f"Mesh({len(self.vertices)} vertices, {len(self.triangles)} triangles)"
+
+    @classmethod
+    def concatenate(cls, meshes: list["Mesh"]) -> "Mesh":
+        """Combine several meshes into one. A single mesh is returned as is."""
+        if not meshes:
+            return cls(
+                np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.uint32)
+            )
+        if len(meshes) == 1:
+            return meshes[0]
+
+        offsets = np.cumsum(
+            [0] + [len(mesh.vertices) for mesh in meshes[:-1]], dtype=np.uint32
+        )
+        return cls(
+            np.concatenate([mesh.vertices for mesh in meshes]),
+            np.concatenate(
+                [mesh.triangles + offset for mesh, offset in zip(meshes, offsets)]
+            ),
+        )
+
+    def transformed(self, location: TopLoc_Location) -> "Mesh":
+        """
+        Get a copy of the mesh moved to the given location. The identity
+        location returns the mesh itself.
+        """
+        transformation = location.Transformation()
+        matrix = np.array(
+            [[transformation.Value(i, j) for j in range(1, 5)] for i in range(1, 4)]
+        )
+        # Parts are often placed at an identity location that isn't empty
+        if np.array_equal(matrix, np.eye(3, 4)):
+            return self
+        vertices = self.vertices @ matrix[:, :3].T + matrix[:, 3]
+        return Mesh(vertices.astype(np.float32), self.triangles)
+
+    def normals(self) -> np.ndarray:
+        """Get the unit normal of each triangle."""
+        v0, v1, v2 = (self.vertices[self.triangles[:, k]] for k in range(3))
+        normals = np.cross(v1 - v0, v2 - v0)
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        return np.divide(
+            normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+        )
+
+    def save(self, directory: str | PathLike) -> None:
+        """
+        Save the arrays to ``vertices.npy`` and ``triangles.npy`` in a
+        directory, which is created if needed.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "vertices.npy", self.vertices)
+        np.save(directory / "triangles.npy", self.triangles)
+
+    @classmethod
+    def load(cls, directory: str | PathLike, mmap: bool = True) -> "Mesh":
+        """
+        Load a mesh saved by :meth:`save`.
+
+        :param directory: The directory of the mesh.
+        :param mmap: Map the files into memory read-only, rather than reading
+            them, so that the arrays are only paged in as they are used.
+        """
+        directory = Path(directory)
+        mode: Literal["r"] | None = "r" if mmap else None
+        return cls(
+            np.load(directory / "vertices.npy", mmap_mode=mode),
+            np.load(directory / "triangles.npy", mmap_mode=mode),
+        )
+
+
+class MeshMixin:
+    """Adds cached, array-based tessellation to a part class."""
+
+    def mesh_arrays(
+        self,
+        tolerance: float = 1e-3,
+        angular_tolerance: float = 0.1,
+        path: str | PathLike | None = None,
+    ) -> Mesh:
+        """
+        Get the triangle mesh of the part as contiguous float32 vertex and
+        uint32 triangle arrays. The mesh of a part at its original location
+        is the cached mesh itself, which is read-only.
+
+        :param tolerance: Maximum linear deviation of the mesh from the surface.
+        :param angular_tolerance: Maximum angular deviation in radians.
+        :param path: A directory to save the mesh to. If given, the returned
+            arrays are read-only memory maps of the saved files.
+        """
+        mesh = tessellate(cast(Shape, self), tolerance, angular_tolerance)
+        if path is None:
+            return mesh
+        mesh.save(path)
+        return Mesh.load(path)
+
+
+def _weld(mesh: Mesh, decimals: int = 5) -> Mesh:
+    """
+    Merge the vertices that the faces of a mesh share along their edges, so
+    that the mesh is closed, and drop the triangles that collapse.
+
+    :param decimals: Vertices that are equal to this many decimal places of
+        a millimeter are merged.
+    """
+    _, first, inverse = np.unique(
+        mesh.vertices.round(decimals), axis=0, return_index=True, return_inverse=True
+    )
+    triangles = inverse.reshape(-1)[mesh.triangles].astype(np.uint32)
+    collapsed = (
+        (triangles[:, 0] == triangles[:, 1])
+        | (triangles[:, 1] == triangles[:, 2])
+        | (triangles[:, 2] == triangles[:, 0])
+    )
+    return Mesh(mesh.vertices[first], triangles[~collapsed])
+
+
+def _mesh_shape(
+    shape: TopoDS_Shape, tolerance: float, angular_tolerance: float
+) -> Mesh:
+    """Tessellate a shape and gather the triangles of all of its faces."""
+    BRepMesh_IncrementalMesh(shape, tolerance, False, angular_tolerance, True)
+
+    meshes = []
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        explorer.Next()
+
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation_s(face, location)
+        if triangulation is None:
+            continue
+
+        nodes = triangulation.NbNodes()
+        vertices = np.fromiter(
+            (c for i in range(1, nodes + 1) for c in triangulation.Node(i).Coord()),
+            dtype=np.float64,
+            count=3 * nodes,
+        ).reshape(-1, 3)
+        triangles = np.fromiter(
+            (i for triangle in triangulation.Triangles() for i in triangle.Get()),
+            dtype=np.uint32,
+            count=3 * triangulation.NbTriangles(),
+        ).reshape(-1, 3)
+        triangles -= 1
+        if face.Orientation() == TopAbs_REVERSED:
+            triangles = triangles[:, ::-1]
+        mesh = Mesh(vertices, triangles).transformed(location)
+        meshes.append(Mesh(mesh.vertices.astype(np.float32), mesh.triangles))
+
+    # The cached arrays are shared by every copy of the shape at the origin
+    mesh = _weld(Mesh.concatenate(meshes))
+    vertices = np.ascontiguousarray(mesh.vertices)
+    triangles = np.ascontiguousarray(mesh.triangles)
+    vertices.flags.writeable = False
+    triangles.flags.writeable = False
+    return Mesh(vertices, triangles)
+
+
+def _cached_mesh(
+    shape: TopoDS_Shape, tolerance: float, angular_tolerance: float
+) -> Mesh:
+    """
+    Get the mesh of a shape that isn't a compound, at the shape's location,
+    from the cache of meshes of its unlocated geometry.
+    """
+    local = shape.Located(TopLoc_Location())
+    key = (hash(local), tolerance, angular_tolerance)
+    cached, mesh = mesh_cache.get(
+        key, lambda: (local, _mesh_shape(local, tolerance, angular_tolerance))
+    )
+    if not cached.IsEqual(local):  # A hash collision, which is very unlikely
+        mesh = _mesh_shape(local, tolerance, angular_tolerance)
+    return mesh.transformed(shape.Location())
+
+
+def tessellate(
+    shape: Shape,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> Mesh:
+    """
+    Get a triangle mesh of a shape, reusing the cached meshes of its solids.
+
+    :param shape: The shape to tessellate, such as a part or an assembly.
+    :param tolerance: Maximum linear deviation of the mesh from the surface.
+    :param angular_tolerance: Maximum angular deviation in radians.
+    """
+    if shape.wrapped is None:
+        raise ValueError("Cannot tessellate an empty shape")
+
+    meshes = []
+    stack = [shape.wrapped]
+    while stack:
+        current = stack.pop()
+        if current.ShapeType() == TopAbs_COMPOUND:
+            children = []
+            iterator = TopoDS_Iterator(current)
+            while iterator.More():
+                children.append(iterator.Value())
+                iterator.Next()
+            stack.extend(reversed(children))  # Keep the order of the children
+        else:
+            meshes.append(_cached_mesh(current, tolerance, angular_tolerance))
+    return Mesh.concatenate(meshes)
+
+
+def write_stl(mesh: Mesh, file_path: str | PathLike) -> None:
+    """Write a mesh to a binary STL file."""
+    record = np.dtype(
+        [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+    )
+    data = np.zeros(len(mesh.triangles), dtype=record)
+    data["normal"] = mesh.normals()
+    data["vertices"] = mesh.vertices[mesh.triangles]
+
+    with open(file_path, "wb") as f:
+        f.write(b"bd-vslot".ljust(80, b" "))
+        f.write(np.uint32(len(data)).tobytes())
+        data.tofile(f)
+
+
+_3MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" '
+    'ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>"
+)
+_3MF_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>"
+)
+_3MF_MODEL = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<model unit="millimeter" xml:lang="en-US" '
+    'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+    '<resources><object id="1" type="model"><mesh><vertices>{vertices}</vertices>'
+    "<triangles>{triangles}</triangles></mesh></object></resources>"
+    '<build><item objectid="1"/></build></model>'
+)
+
+
+def write_3mf(mesh: Mesh, file_path: str | PathLike) -> None:
+    """Write a mesh to a 3MF file."""
+    vertices = ('<vertex x="%.9g" y="%.9g" z="%.9g"/>' * len(mesh.vertices)) % tuple(
+        mesh.vertices.ravel().tolist()
+    )
+    triangles = ('<triangle v1="%d" v2="%d" v3="%d"/>' * len(mesh.triangles)) % tuple(
+        mesh.triangles.ravel().tolist()
+    )
+
+    with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _3MF_RELATIONSHIPS)
+        archive.writestr(
+            "3D/3dmodel.model",
+            _3MF_MODEL.format(vertices=vertices, triangles=triangles),
+        )
+
+
+def export_mesh_stl(
+    to_export: Shape,
+    file_path: str | PathLike,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> None:
+    """Export a shape to a binary STL file, using cached meshes."""
+    write_stl(tessellate(to_export, tolerance, angular_tolerance), file_path)
+
+
+def export_mesh_3mf(
+    to_export: Shape,
+    file_path: str | PathLike,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> None:
+    """Export a shape to a 3MF file, using cached meshes."""
+    write_3mf(tessellate(to_export, tolerance, angular_tolerance), file_path)
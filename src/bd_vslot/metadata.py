@@ -0,0 +1,123 @@
+"""
+Analytic metadata of parts.
+
+Every parameterized part has an ``estimate`` method that returns the volume,
+mass, bounding box and holes of the part that its constructor would build.
+These are computed in closed form from the dimensions of the part, without
+building any geometry, so they are cheap enough to call for every line of a
+bill of materials.
+
+Values are given in the part's own frame, before any rotation or alignment,
+in millimeters and grams.
+"""
+
+from collections.abc import Iterable
+from math import pi
+from typing import NamedTuple
+
+Vector3 = tuple[float, float, float]
+
+
+class HoleInfo(NamedTuple):
+    """
+    A cylindrical hole through a part.
+
+    :param position: Center of the hole where it enters the part.
+    :param direction: Unit vector along the axis of the hole, into the part.
+    :param radius: Radius of the hole.
+    """
+
+    position: Vector3
+    direction: Vector3
+    radius: float
+
+
+class Metadata(NamedTuple):
+    """
+    Analytic properties of a part.
+
+    :param volume: Volume of the part in cubic millimeters.
+    :param mass: Mass of the part in grams.
+    :param bounding_box: Minimum and maximum corners of the bounding box.
+    :param holes: The holes through the part.
+    """
+
+    volume: float
+    mass: float
+    bounding_box: tuple[Vector3, Vector3]
+    holes: tuple[HoleInfo, ...]
+
+
+def polygon_area(points: Iterable[tuple[float, float]]) -> float:
+    """Return the area of a simple polygon given by its vertices."""
+    points = list(points)
+    return abs(
+        sum(
+            x0 * y1 - x1 * y0
+            for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1])
+        )
+        / 2
+    )
+
+
+def rectangle_area(width: float, height: float, corner_radius: float = 0) -> float:
+    """Return the area of a rectangle, optionally with rounded corners."""
+    return width * height - (4 - pi) * corner_radius**2
+
+
+def chamfer_volume(
+    width: float,
+    height: float,
+    corner_radius: float,
+    chamfer_size: float,
+) -> float:
+    """
+    Return the volume removed by chamfering the top edges of a rectangular
+    plate, optionally with rounded corners.
+
+    This is the area of the chamfer's cross-section times the length of the
+    path swept by its centroid (Pappus's theorem).
+    """
+    if corner_radius:
+        path = (
+            2 * (width + height)
+            - 8 * corner_radius
+            + 2 * pi * (corner_radius - chamfer_size / 3)
+        )
+    else:
+        path = 2 * (width + height) - 8 * chamfer_size / 3
+    return chamfer_size**2 / 2 * path
+
+
+def hole_grid(
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    radius: float,
+    *,
+    origin: Vector3 = (0, 0, 0),
+    x_dir: Vector3 = (1, 0, 0),
+    y_dir: Vector3 = (0, 1, 0),
+    direction: Vector3 = (0, 0, 1),
+) -> tuple[HoleInfo, ...]:
+    """
+    Return a grid of holes centered on the origin, in the same order as
+    :class:`build123d.GridLocations`.
+
+    :param pitch: Distance between neighbouring holes.
+    :param num_x_holes: Number of holes along the X direction.
+    :param num_y_holes: Number of holes along the Y direction.
+    :param radius: Radius of the holes.
+    :param origin: Center of the grid.
+    :param x_dir: Direction of the grid's X-axis.
+    :param y_dir: Direction of the grid's Y-axis.
+    :param direction: Direction of the holes, into the part.
+    """
+    holes = []
+    for i in range(num_x_holes):
+        for j in range(num_y_holes):
+            x = pitch * (i - (num_x_holes - 1) / 2)
+            y = pitch * (j - (num_y_holes - 1) / 2)
+            px, py, pz = (o + x * u + y * v for o, u, v in zip(origin, x_dir, y_dir))
+            holes.append(HoleInfo((px, py, pz), direction, radius))
+    return tuple(holes)
@@ -1,16 +1,47 @@
 from build123d import *
 
+from bd_vslot.cache import cached, geometry_cache
 from bd_vslot.constants import HOLE_TOLERANCE, BoltSize
+from bd_vslot.mesh import MeshMixin
+from bd_vslot.profiling import profiled, stage
 from bd_vslot.utils.typing import Align3D
 
 
-class VSlot2020SlidingTNut(BasePartObject):
+@cached(geometry_cache)
+def _sliding_t_nut(hole_radius: float) -> Part:
+    """Build the geometry of a sliding T-nut with the given hole radius."""
+    with BuildPart() as nut:
+        with stage("sketch"), BuildSketch(Plane.YZ):
+            with BuildLine():
+                Polyline(
+                    (0, 4.5),
+                    (3.1, 4.5),
+                    (3.1, 3),
+                    (4.75, 3),
+                    (4.75, 2),
+                    (2.75, 0),
+                    (0, 0),
+                )
+                mirror(about=Plane.YZ)
+            make_face()
+        with stage("extrude"):
+            extrude(amount=4.75, both=True)
+        with stage("hole"):
+            Hole(hole_radius)
+
+    return nut.part
+
+
+class VSlot2020SlidingTNut(BasePartObject, MeshMixin):
     """
     Sliding T-nut compatible with 2020 V-Slot rails.
 
+    The geometry is cached by hole radius (see :mod:`bd_vslot.cache`).
+
     :param hole_radius: The radius of the hole for the bolt.
     """
 
+    @profiled
     def __init__(
         self,
         hole_radius: BoltSize | float,
@@ -22,21 +53,6 @@ class VSlot2020SlidingTNut(BasePartObject):
         if isinstance(hole_radius, BoltSize):
             hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-        with BuildPart() as nut:
-            with BuildSketch(Plane.YZ):
-                with BuildLine():
-                    Polyline(
-                        (0, 4.5),
-                        (3.1, 4.5),
-                        (3.1, 3),
-                        (4.75, 3),
-                        (4.75, 2),
-                        (2.75, 0),
-                        (0, 0),
-                    )
-                    mirror(about=Plane.YZ)
-                make_face()
-            extrude(amount=4.75, both=True)
-            Hole(hole_radius)
-
-        super().__init__(nut.part, rotation, align, mode)
+        part = _sliding_t_nut(hole_radius)
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
@@ -1,10 +1,213 @@
 from __future__ import annotations
 
+from math import inf, pi, sqrt
+
 from build123d import *
 
-from bd_vslot.constants import HOLE_TOLERANCE, BoltSize
+from bd_vslot.cache import cached, disk_cache, disk_cached, profile_cache
+from bd_vslot.constants import ALUMINIUM_DENSITY, HOLE_TOLERANCE, BoltSize
+from bd_vslot.mesh import MeshMixin
+from bd_vslot.metadata import Metadata, chamfer_volume, hole_grid, rectangle_area
+from bd_vslot.profiling import profiled, stage
 from bd_vslot.utils.typing import Align2D, Align3D
 
+_OVERLAP_ERROR = (
+    "Can't estimate a plate whose holes overlap each other, the outline or "
+    "the chamfer"
+)
+
+# Plates with more holes than this are chamfered by subtracting a ring.
+_CHAMFER_RING_HOLES = 100
+
+
+def _holes_overlap(
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+    margin: float,
+) -> bool:
+    """
+    Check if any hole of a grid overlaps another hole or the outline, where
+    the outer holes are the given margin from the edges.
+    """
+    spacing = pitch if max(num_x_holes, num_y_holes) > 1 else inf
+    if not 0 < hole_radius < min(margin, spacing / 2):
+        return True
+    # A corner hole is cut by a corner that is rounded more than the margin
+    return sqrt(2) * (corner_radius - margin) + hole_radius > corner_radius
+
+
+def _hole_grid(
+    width: float,
+    height: float,
+    corner_radius: float,
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+) -> Face | None:
+    """
+    Build a face with a grid of holes without any boolean operations.
+
+    The holes are given to the face as inner wires, which is only valid when
+    no hole overlaps another hole or the outline. Returns None otherwise.
+
+    :param width: Width of the outline.
+    :param height: Height of the outline.
+    :param corner_radius: Filet radius for the corners of the outline.
+    :param pitch: Distance between neighbouring holes.
+    :param num_x_holes: Number of holes along the X-axis.
+    :param num_y_holes: Number of holes along the Y-axis.
+    :param hole_radius: The radius of the holes.
+    """
+    margin = min(
+        (width - pitch * (num_x_holes - 1)) / 2,
+        (height - pitch * (num_y_holes - 1)) / 2,
+    )
+    if corner_radius > margin or _holes_overlap(
+        pitch, num_x_holes, num_y_holes, hole_radius, corner_radius, margin
+    ):
+        return None
+
+    with BuildSketch() as outline:
+        (
+            RectangleRounded(width, height, corner_radius)
+            if corner_radius
+            else Rectangle(width, height)
+        )
+
+    holes = GridLocations(pitch, pitch, num_x_holes, num_y_holes).locations
+    return Face(
+        outline.face().outer_wire(),
+        [Wire.make_circle(hole_radius).moved(location) for location in holes],
+    )
+
+
+def _chamfer_ring(
+    width: float,
+    height: float,
+    corner_radius: float,
+    thickness: float,
+    chamfer_size: float,
+) -> Part:
+    """
+    Build the material removed by chamfering the top edges of a plate.
+
+    Subtracting this ring from a plate with holes is much faster than
+    chamfering it directly, as the chamfer never has to rebuild the top face.
+
+    :param width: Width of the plate.
+    :param height: Height of the plate.
+    :param corner_radius: Filet radius for the corners of the plate.
+    :param thickness: Thickness of the plate.
+    :param chamfer_size: Size of chamfer on top edges of the plate.
+    """
+    with BuildPart() as block:
+        with BuildSketch():
+            (
+                RectangleRounded(width, height, corner_radius)
+                if corner_radius
+                else Rectangle(width, height)
+            )
+        extrude(amount=thickness)
+        chamfer(
+            block.edges().filter_by(GeomType.LINE).group_by(Axis.Z)[-1],
+            chamfer_size,
+        )
+
+    with BuildPart() as ring:
+        with BuildSketch():
+            (
+                RectangleRounded(width + 2, height + 2, corner_radius)
+                if corner_radius
+                else Rectangle(width + 2, height + 2)
+            )
+        extrude(amount=thickness)
+        add(block.part, mode=Mode.SUBTRACT)
+
+    return ring.part
+
+
+@cached(profile_cache)
+def _plate_profile(
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+) -> Sketch:
+    """
+    Build the profile of a plate with a grid of holes and a 10 mm margin
+    around them. Plates of every thickness and chamfer share the profile.
+    """
+    width = pitch * (num_x_holes - 1) + 20
+    height = pitch * (num_y_holes - 1) + 20
+
+    with BuildSketch() as profile:
+        with stage("holes"):
+            face = _hole_grid(
+                width,
+                height,
+                corner_radius,
+                pitch,
+                num_x_holes,
+                num_y_holes,
+                hole_radius,
+            )
+        if face is not None:
+            add(face)
+        else:
+            with stage("outline"):
+                (
+                    RectangleRounded(width, height, corner_radius)
+                    if corner_radius
+                    else Rectangle(width, height)
+                )
+            with stage("holes"), GridLocations(pitch, pitch, num_x_holes, num_y_holes):
+                Circle(hole_radius, mode=Mode.SUBTRACT)
+
+    return profile.sketch
+
+
+def _plate_metadata(
+    thickness: float,
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+    chamfer_size: float,
+    density: float,
+    *,
+    margin: float,
+) -> Metadata:
+    """
+    Compute the metadata of a flat plate with a grid of holes. The holes
+    must be apart from each other, the outline and the chamfer.
+    """
+    if _holes_overlap(
+        pitch, num_x_holes, num_y_holes, hole_radius, corner_radius, margin
+    ) or (chamfer_size > 0 and chamfer_size >= margin - hole_radius):
+        raise ValueError(_OVERLAP_ERROR)
+
+    width = pitch * (num_x_holes - 1) + 2 * margin
+    height = pitch * (num_y_holes - 1) + 2 * margin
+    holes = hole_grid(pitch, num_x_holes, num_y_holes, hole_radius)
+    volume = (
+        rectangle_area(width, height, corner_radius) - len(holes) * pi * hole_radius**2
+    ) * thickness
+    if chamfer_size > 0:
+        volume -= chamfer_volume(width, height, corner_radius, chamfer_size)
+
+    return Metadata(
+        volume,
+        volume * density,
+        ((-width / 2, -height / 2, 0), (width / 2, height / 2, thickness)),
+        holes,
+    )
+
 
 class VSlot2020EndCapProfile(BaseSketchObject):
     """
@@ -20,6 +223,7 @@ class VSlot2020EndCapProfile(BaseSketchObject):
     :param corner_radius: Filet radius for the corners of the end cap.
     """
 
+    @profiled
     def __init__(
         self,
         num_x_holes: int,
@@ -34,22 +238,57 @@ class VSlot2020EndCapProfile(BaseSketchObject):
         if isinstance(hole_radius, BoltSize):
             hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-        width = 20 * num_x_holes
-        height = 20 * num_y_holes
-
-        with BuildSketch() as profile:
-            (
-                RectangleRounded(width, height, corner_radius)
-                if corner_radius
-                else Rectangle(width, height)
+        profile = _plate_profile(
+            20, num_x_holes, num_y_holes, hole_radius, corner_radius
+        )
+        with stage("place"):
+            super().__init__(profile, rotation, align, mode)
+
+
+@disk_cached(disk_cache)
+def _end_cap(
+    thickness: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+    chamfer_size: float,
+) -> Part:
+    """Build the geometry of an end cap with the given dimensions."""
+    with BuildPart() as plate:
+        with BuildSketch():
+            VSlot2020EndCapProfile(
+                num_x_holes,
+                num_y_holes,
+                hole_radius,
+                corner_radius,
             )
-            with GridLocations(20, 20, num_x_holes, num_y_holes):
-                Circle(hole_radius, mode=Mode.SUBTRACT)
+        with stage("extrude"):
+            extrude(amount=thickness)
 
-        super().__init__(profile.sketch, rotation, align, mode)
+        if chamfer_size > 0 and num_x_holes * num_y_holes > _CHAMFER_RING_HOLES:
+            with stage("chamfer"):
+                add(
+                    _chamfer_ring(
+                        20 * num_x_holes,
+                        20 * num_y_holes,
+                        corner_radius,
+                        thickness,
+                        chamfer_size,
+                    ),
+                    mode=Mode.SUBTRACT,
+                )
+        elif chamfer_size > 0:
+            with stage("chamfer"):
+                chamfer(
+                    plate.edges().filter_by(GeomType.LINE).group_by(Axis.Z)[-1],
+                    chamfer_size,
+                )
 
+    return plate.part
 
-class VSlot2020EndCap(BasePartObject):
+
+class VSlot2020EndCap(BasePartObject, MeshMixin):
     """
     An end cap for 2020 V-Slot rails.
 
@@ -65,6 +304,7 @@ class VSlot2020EndCap(BasePartObject):
     :param chamfer_size: Size of chamfer on top edges of the end cap.
     """
 
+    @profiled
     def __init__(
         self,
         thickness: float,
@@ -78,23 +318,54 @@ class VSlot2020EndCap(BasePartObject):
         align: Align3D = None,
         mode: Mode = Mode.ADD,
     ):
-        with BuildPart() as plate:
-            with BuildSketch():
-                VSlot2020EndCapProfile(
-                    num_x_holes,
-                    num_y_holes,
-                    hole_radius,
-                    corner_radius,
-                )
-            extrude(amount=thickness)
+        if isinstance(hole_radius, BoltSize):
+            hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-            if chamfer_size > 0:
-                chamfer(
-                    plate.edges().filter_by(GeomType.LINE).group_by(Axis.Z)[-1],
-                    chamfer_size,
-                )
+        part = _end_cap(
+            thickness,
+            num_x_holes,
+            num_y_holes,
+            hole_radius,
+            corner_radius,
+            chamfer_size,
+        )
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
+
+    @staticmethod
+    def estimate(
+        thickness: float,
+        num_x_holes: int,
+        num_y_holes: int,
+        hole_radius: BoltSize | float,
+        corner_radius: float = 0,
+        chamfer_size: float = 0,
+        density: float = ALUMINIUM_DENSITY,
+    ) -> Metadata:
+        """
+        Compute the metadata of an end cap without building it.
+
+        See :mod:`bd_vslot.metadata`. Takes the same arguments as the
+        constructor, plus the density of the material in grams per cubic
+        millimeter.
+
+        :raises ValueError: If the holes overlap each other, the edges or
+            the chamfer, which the estimate doesn't account for.
+        """
+        if isinstance(hole_radius, BoltSize):
+            hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-        super().__init__(plate.part, rotation, align, mode)
+        return _plate_metadata(
+            thickness,
+            20,
+            num_x_holes,
+            num_y_holes,
+            hole_radius,
+            corner_radius,
+            chamfer_size,
+            density,
+            margin=10,
+        )
 
 
 class BuildPlateProfile(BaseSketchObject):
@@ -111,6 +382,7 @@ class BuildPlateProfile(BaseSketchObject):
     :param corner_radius: Filet radius for the corners of the plate.
     """
 
+    @profiled
     def __init__(
         self,
         num_x_holes: int,
@@ -125,22 +397,57 @@ class BuildPlateProfile(BaseSketchObject):
         if isinstance(hole_radius, BoltSize):
             hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-        width = 10 * (num_x_holes + 1)
-        height = 10 * (num_y_holes + 1)
-
-        with BuildSketch() as profile:
-            (
-                RectangleRounded(width, height, corner_radius)
-                if corner_radius
-                else Rectangle(width, height)
+        profile = _plate_profile(
+            10, num_x_holes, num_y_holes, hole_radius, corner_radius
+        )
+        with stage("place"):
+            super().__init__(profile, rotation, align, mode)
+
+
+@disk_cached(disk_cache)
+def _build_plate(
+    thickness: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+    chamfer_size: float,
+) -> Part:
+    """Build the geometry of a build plate with the given dimensions."""
+    with BuildPart() as plate:
+        with BuildSketch():
+            BuildPlateProfile(
+                num_x_holes,
+                num_y_holes,
+                hole_radius,
+                corner_radius,
             )
-            with GridLocations(10, 10, num_x_holes, num_y_holes):
-                Circle(hole_radius, mode=Mode.SUBTRACT)
+        with stage("extrude"):
+            extrude(amount=thickness)
 
-        super().__init__(profile.sketch, rotation, align, mode)
+        if chamfer_size > 0 and num_x_holes * num_y_holes > _CHAMFER_RING_HOLES:
+            with stage("chamfer"):
+                add(
+                    _chamfer_ring(
+                        10 * (num_x_holes + 1),
+                        10 * (num_y_holes + 1),
+                        corner_radius,
+                        thickness,
+                        chamfer_size,
+                    ),
+                    mode=Mode.SUBTRACT,
+                )
+        elif chamfer_size > 0:
+            with stage("chamfer"):
+                chamfer(
+                    plate.edges().filter_by(GeomType.LINE).group_by(Axis.Z)[-1],
+                    chamfer_size,
+                )
 
+    return plate.part
 
-class BuildPlate(BasePartObject):
+
+class BuildPlate(BasePartObject, MeshMixin):
     """
     A common build plate with a grid of mounting holes.
 
@@ -155,6 +462,7 @@ class BuildPlate(BasePartObject):
     :param corner_radius: Filet radius for the corners of the plate.
     """
 
+    @profiled
     def __init__(
         self,
         thickness: float,
@@ -168,26 +476,98 @@ class BuildPlate(BasePartObject):
         align: Align3D = None,
         mode: Mode = Mode.ADD,
     ):
-        with BuildPart() as plate:
-            with BuildSketch():
-                BuildPlateProfile(
-                    num_x_holes,
-                    num_y_holes,
-                    hole_radius,
-                    corner_radius,
-                )
+        if isinstance(hole_radius, BoltSize):
+            hole_radius = hole_radius.value + HOLE_TOLERANCE
+
+        part = _build_plate(
+            thickness,
+            num_x_holes,
+            num_y_holes,
+            hole_radius,
+            corner_radius,
+            chamfer_size,
+        )
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
+
+    @staticmethod
+    def estimate(
+        thickness: float,
+        num_x_holes: int,
+        num_y_holes: int,
+        hole_radius: BoltSize | float,
+        corner_radius: float = 0,
+        chamfer_size: float = 0,
+        density: float = ALUMINIUM_DENSITY,
+    ) -> Metadata:
+        """
+        Compute the metadata of a build plate without building it.
+
+        See :mod:`bd_vslot.metadata`. Takes the same arguments as the
+        constructor, plus the density of the material in grams per cubic
+        millimeter.
+
+        :raises ValueError: If the holes overlap each other, the edges or
+            the chamfer, which the estimate doesn't account for.
+        """
+        if isinstance(hole_radius, BoltSize):
+            hole_radius = hole_radius.value + HOLE_TOLERANCE
+
+        return _plate_metadata(
+            thickness,
+            10,
+            num_x_holes,
+            num_y_holes,
+            hole_radius,
+            corner_radius,
+            chamfer_size,
+            density,
+            margin=10,
+        )
+
+
+@disk_cached(disk_cache)
+def _l_plate(
+    thickness: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    num_z_holes: int,
+    hole_radius: float,
+    corner_radius: float,
+) -> Part:
+    """Build the geometry of an L-plate with the given dimensions."""
+    with BuildPart() as plate:
+        with BuildSketch(Plane.XY):
+            BuildPlateProfile(
+                num_x_holes,
+                num_y_holes,
+                hole_radius,
+                corner_radius=0,
+                align=(Align.CENTER, Align.MIN),
+            )
+        with BuildSketch(Plane.XZ):
+            BuildPlateProfile(
+                num_x_holes,
+                num_z_holes,
+                hole_radius,
+                corner_radius=0,
+                align=(Align.CENTER, Align.MIN),
+            )
+        with stage("extrude"):
             extrude(amount=thickness)
 
-            if chamfer_size > 0:
-                chamfer(
-                    plate.edges().filter_by(GeomType.LINE).group_by(Axis.Z)[-1],
-                    chamfer_size,
+        if corner_radius:
+            with stage("fillet"):
+                fillet(
+                    plate.edges().group_by(Axis.Z)[-1].filter_by(Axis.Y)
+                    + plate.edges().group_by(Axis.Y)[-1].filter_by(Axis.Z),
+                    corner_radius,
                 )
 
-        super().__init__(plate.part, rotation, align, mode)
+    return plate.part
 
 
-class LPlate(BasePartObject):
+class LPlate(BasePartObject, MeshMixin):
     """
     An L-shaped plate (bracket) with a grid of mounting holes on each face.
 
@@ -203,6 +583,7 @@ class LPlate(BasePartObject):
     :param corner_radius: Filet radius for the corners of the plate.
     """
 
+    @profiled
     def __init__(
         self,
         thickness: float,
@@ -219,30 +600,74 @@ class LPlate(BasePartObject):
         if isinstance(hole_radius, BoltSize):
             hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-        with BuildPart() as plate:
-            with BuildSketch(Plane.XY):
-                BuildPlateProfile(
-                    num_x_holes,
-                    num_y_holes,
-                    hole_radius,
-                    corner_radius=0,
-                    align=(Align.CENTER, Align.MIN),
-                )
-            with BuildSketch(Plane.XZ):
-                BuildPlateProfile(
-                    num_x_holes,
-                    num_z_holes,
-                    hole_radius,
-                    corner_radius=0,
-                    align=(Align.CENTER, Align.MIN),
-                )
-            extrude(amount=thickness)
+        part = _l_plate(
+            thickness,
+            num_x_holes,
+            num_y_holes,
+            num_z_holes,
+            hole_radius,
+            corner_radius,
+        )
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
+
+    @staticmethod
+    def estimate(
+        thickness: float,
+        num_x_holes: int,
+        num_y_holes: int,
+        num_z_holes: int,
+        hole_radius: BoltSize | float,
+        corner_radius: float = 0,
+        density: float = ALUMINIUM_DENSITY,
+    ) -> Metadata:
+        """
+        Compute the metadata of an L-plate without building it.
+
+        See :mod:`bd_vslot.metadata`. Takes the same arguments as the
+        constructor, plus the density of the material in grams per cubic
+        millimeter.
+
+        :raises ValueError: If the holes overlap each other, the edges or
+            the chamfer, which the estimate doesn't account for.
+        """
+        if isinstance(hole_radius, BoltSize):
+            hole_radius = hole_radius.value + HOLE_TOLERANCE
 
-            if corner_radius:
-                fillet(
-                    plate.edges().group_by(Axis.Z)[-1].filter_by(Axis.Y)
-                    + plate.edges().group_by(Axis.Y)[-1].filter_by(Axis.Z),
-                    corner_radius,
-                )
+        if _holes_overlap(
+            10, num_x_holes, max(num_y_holes, num_z_holes), hole_radius, 0, 10
+        ) or _holes_overlap(10, 1, 1, hole_radius, corner_radius, 10):
+            raise ValueError(_OVERLAP_ERROR)
 
-        super().__init__(plate.part, rotation, align, mode)
+        # The plate is the union of a horizontal and a vertical build plate,
+        # which only touch along the bend, each with two corners filleted.
+        width = 10 * (num_x_holes + 1)
+        depth = 10 * (num_y_holes + 1)
+        height = 10 * (num_z_holes + 1)
+        holes = hole_grid(
+            10,
+            num_x_holes,
+            num_y_holes,
+            hole_radius,
+            origin=(0, depth / 2, 0),
+        ) + hole_grid(
+            10,
+            num_x_holes,
+            num_z_holes,
+            hole_radius,
+            origin=(0, 0, height / 2),
+            y_dir=(0, 0, 1),
+            direction=(0, -1, 0),
+        )
+        volume = (
+            width * (depth + height)
+            - len(holes) * pi * hole_radius**2
+            - 4 * (1 - pi / 4) * corner_radius**2
+        ) * thickness
+
+        return Metadata(
+            volume,
+            volume * density,
+            ((-width / 2, -thickness, 0), (width / 2, depth, height)),
+            holes,
+        )
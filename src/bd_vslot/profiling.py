@@ -0,0 +1,330 @@
+import atexit
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, get_ident
+from time import perf_counter
+from typing import Any, Concatenate, NamedTuple, ParamSpec, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+P = ParamSpec("P")
+S = TypeVar("S")
+
+
+class Event(NamedTuple):
+    """A timed span of work, such as building a part or one of its stages."""
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+    args: dict[str, Any]
+
+
+class MemoryUsage(NamedTuple):
+    """
+    The memory used by the process, or the change in it over a build.
+
+    :param rss: Resident set size in bytes.
+    :param peak_rss: Peak resident set size in bytes.
+    :param traced: Bytes allocated by Python, if tracemalloc is tracing.
+    :param shapes: Live build123d shapes, if memory profiling is active.
+    :param builders: Live build123d builders (BuildPart, BuildSketch, etc.),
+        if memory profiling is active.
+    """
+
+    rss: int
+    peak_rss: int
+    traced: int
+    shapes: int
+    builders: int
+
+
+# The number of active profilers in memory mode
+_tracking = 0
+
+
+def _subclasses(cls: type[Any]) -> set[type[Any]]:
+    """Get a class and all of its subclasses."""
+    classes = {cls}
+    for subclass in cls.__subclasses__():
+        classes |= _subclasses(subclass)
+    return classes
+
+
+def _count_live() -> tuple[int, int]:
+    """
+    Count the live build123d shapes and builders. This walks every object
+    that the garbage collector tracks, which takes tens of milliseconds, so
+    it is only done while memory profiling is active.
+    """
+    from build123d.build_common import Builder
+    from build123d.topology import Shape
+
+    counts = Counter(map(type, gc.get_objects()))
+    shapes = sum(counts[cls] for cls in _subclasses(Shape))
+    builders = sum(counts[cls] for cls in _subclasses(Builder))
+    return shapes, builders
+
+
+def memory_usage() -> MemoryUsage:
+    """Measure the memory used by the process."""
+    peak_rss = 0
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes and macOS bytes
+        peak_rss *= 1 if sys.platform == "darwin" else 1024
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        rss = peak_rss
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    shapes, builders = _count_live() if _tracking else (0, 0)
+    return MemoryUsage(rss, peak_rss, traced, shapes, builders)
+
+
+class Profiler:
+    """
+    Records the wall time of each part, construction stage and boolean
+    operation while it is active (see :func:`profile`).
+
+    In memory mode, each part event also records the change in memory usage
+    over its build (see :class:`MemoryUsage`), and tracemalloc snapshots are
+    taken when profiling starts and stops.
+
+    :param memory: Whether to profile memory.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.events: list[Event] = []
+        self.memory = memory
+        self.snapshots: list[tracemalloc.Snapshot] = []
+        self._origin = perf_counter()
+        self._lock = Lock()
+
+    def record(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> None:
+        """Record an event given its start and end times from perf_counter."""
+        event = Event(
+            name, category, start - self._origin, end - start, get_ident(), args
+        )
+        with self._lock:
+            self.events.append(event)
+
+    def totals(self) -> dict[tuple[str, str], tuple[int, float]]:
+        """Return the count and total duration of each (category, name)."""
+        totals: dict[tuple[str, str], tuple[int, float]] = {}
+        with self._lock:
+            for event in self.events:
+                count, duration = totals.get((event.category, event.name), (0, 0))
+                totals[event.category, event.name] = (
+                    count + 1,
+                    duration + event.duration,
+                )
+        return totals
+
+    def memory_totals(self) -> dict[str, MemoryUsage]:
+        """
+        Return the total change in memory usage over the builds of each part,
+        and the highest peak RSS. Only parts built in memory mode are
+        included. The changes of a part include those of the parts that it
+        builds.
+        """
+        totals: dict[str, MemoryUsage] = {}
+        with self._lock:
+            for event in self.events:
+                if event.category != "part" or "rss" not in event.args:
+                    continue
+                total = totals.get(event.name, MemoryUsage(0, 0, 0, 0, 0))
+                totals[event.name] = MemoryUsage(
+                    *(
+                        (
+                            max(old, event.args[name])
+                            if name == "peak_rss"
+                            else old + event.args[name]
+                        )
+                        for name, old in total._asdict().items()
+                    )
+                )
+        return totals
+
+    def top_allocations(self, limit: int = 10) -> list[tracemalloc.StatisticDiff]:
+        """
+        Return the lines of code whose Python allocations grew the most
+        between the start and end of profiling in memory mode.
+        """
+        if len(self.snapshots) < 2:
+            return []
+        # Leave out the allocations of the profiler itself
+        filters = [
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]
+        start, end = (self.snapshots[i].filter_traces(filters) for i in (0, -1))
+        return end.compare_to(start, "lineno")[:limit]
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the events in the Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            return {
+                "traceEvents": [
+                    {
+                        "name": event.name,
+                        "cat": event.category,
+                        "ph": "X",
+                        "ts": event.start * 1e6,
+                        "dur": event.duration * 1e6,
+                        "pid": pid,
+                        "tid": event.thread,
+                        "args": event.args,
+                    }
+                    for event in self.events
+                ],
+                "displayTimeUnit": "ms",
+            }
+
+    def dump(self, path: str | os.PathLike) -> None:
+        """Write the events to a Chrome trace JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+# Profilers that are currently recording
+_active: list[Profiler] = []
+_active_lock = Lock()
+_bool_op: Callable[..., Any] | None = None
+
+
+def _timed_bool_op(self: Any, args: Any, tools: Any, operation: Any) -> Any:
+    """Shape._bool_op, recorded as a boolean event."""
+    tools = list(tools)
+    name = type(operation).__name__.removeprefix("BRepAlgoAPI_")
+    with stage(name, "boolean", tools=len(tools)):
+        assert _bool_op is not None
+        return _bool_op(self, args, tools, operation)
+
+
+def _activate(profiler: Profiler) -> None:
+    """Start recording, timing build123d boolean operations too."""
+    global _bool_op, _tracking
+    from build123d.topology import Shape
+
+    with _active_lock:
+        if not _active:
+            _bool_op = Shape._bool_op
+            Shape._bool_op = _timed_bool_op  # type: ignore[method-assign]
+        if profiler.memory:
+            _tracking += 1
+        _active.append(profiler)
+
+
+def _deactivate(profiler: Profiler) -> None:
+    """Stop recording, restoring build123d when no profilers remain."""
+    global _bool_op, _tracking
+    from build123d.topology import Shape
+
+    with _active_lock:
+        _active.remove(profiler)
+        if profiler.memory:
+            _tracking -= 1
+        if not _active and _bool_op is not None:
+            Shape._bool_op = _bool_op  # type: ignore[method-assign]
+            _bool_op = None
+
+
+@contextmanager
+def profile(memory: bool = False) -> Iterator[Profiler]:
+    """
+    Record the construction of every part within the context.
+
+    .. code-block:: python
+
+        with profile() as profiler:
+            BuildPlate(2, 10, 10, BoltSize.M3)
+        profiler.dump("trace.json")
+
+    :param memory: Also profile memory, which starts tracemalloc if it isn't
+        already tracing. This slows down construction two to three times,
+        and adds tens of milliseconds to each part to collect garbage and
+        count the live shapes and builders.
+    """
+    profiler = Profiler(memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _activate(profiler)
+    if memory:
+        profiler.snapshots.append(tracemalloc.take_snapshot())
+    try:
+        yield profiler
+    finally:
+        if memory:
+            profiler.snapshots.append(tracemalloc.take_snapshot())
+        _deactivate(profiler)
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str, category: str = "stage", **args: Any) -> Iterator[dict[str, Any]]:
+    """
+    Time a stage of construction. Does nothing unless profiling is active.
+    Yields the arguments of the event, which may be added to.
+    """
+    if not _active:
+        yield args
+        return
+
+    start = perf_counter()
+    try:
+        yield args
+    finally:
+        end = perf_counter()
+        for profiler in list(_active):
+            profiler.record(name, category, start, end, **args)
+
+
+def profiled(
+    init: Callable[Concatenate[S, P], None],
+) -> Callable[Concatenate[S, P], None]:
+    """Time the constructor of a part, named after the class being built."""
+
+    @wraps(init)
+    def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> None:
+        with stage(type(self).__name__, "part") as event:
+            if not _tracking:
+                init(self, *args, **kwargs)
+                return
+            # Collect the garbage first, so that the live objects that the
+            # collector drops during the build are only ones that it created
+            gc.collect()
+            before = memory_usage()
+            init(self, *args, **kwargs)
+            after = memory_usage()
+            event |= {
+                name: value if name == "peak_rss" else value - old
+                for (name, value), old in zip(after._asdict().items(), before)
+            }
+
+    return wrapper
+
+
+# Profile the whole process if BD_VSLOT_PROFILE is set to a trace file path
+if _path := os.environ.get("BD_VSLOT_PROFILE"):
+    _profiler = Profiler()
+    _activate(_profiler)
+    atexit.register(_profiler.dump, _path)
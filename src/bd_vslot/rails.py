@@ -1,14 +1,398 @@
-from itertools import product
-from typing import Self
+import copy
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from math import pi
+from typing import NamedTuple, Self
 
 import numpy as np
 from build123d import *
-from build123d.build_common import LocationList
+from build123d.topology import downcast
 from numpy.typing import ArrayLike
+from OCP.Bnd import Bnd_Box  # type: ignore[import-untyped]
+from OCP.BRepPrimAPI import BRepPrimAPI_MakePrism  # type: ignore[import-untyped]
+from OCP.gp import gp_Pnt, gp_Trsf, gp_Vec  # type: ignore[import-untyped]
 
-from bd_vslot.utils.array import in_bounds
+from bd_vslot.assembly import Assembly
+from bd_vslot.cache import (
+    cached,
+    disk_cache,
+    disk_cached,
+    profile_cache,
+    rail_cache,
+)
+from bd_vslot.constants import ALUMINIUM_DENSITY, Detail
+from bd_vslot.mesh import MeshMixin
+from bd_vslot.metadata import HoleInfo, Metadata, polygon_area
+from bd_vslot.profiling import profiled, stage
+from bd_vslot.utils.array import outline, signed_area
 from bd_vslot.utils.typing import Align2D, Align3D
 
+# Outlines of the features cut into each exposed cell of a rail profile, for a
+# cell centered on the origin and a feature facing along the X-axis. The slot
+# is mirrored about the X-axis and the cavities are closed polygons.
+_HOLE_RADIUS = 2.1
+_SLOT = (
+    (3.75, 0),
+    (3.9, 0.15),
+    (3.9, 2.84),
+    (6.56, 5.5),
+    (8.2, 5.5),
+    (8.2, 3.125),
+    (8.545, 3.125),
+    (10, 4.58),
+    (10, 0),
+)
+_EDGE_CAVITY = (
+    (10, 0),
+    (3.9, 0),
+    (3.9, 3.16),
+    (7.3, 6.56),
+    (7.3, 8.2),
+    (10, 8.2),
+    (10, 0),
+)
+_CORNER_CAVITY = (
+    (10, 0),
+    (3.9, 0),
+    (3.9, 2.84),
+    (9.26, 8.2),
+    (10, 8.2),
+    (10, 0),
+)
+_CENTER_CAVITY = (
+    (10, 0),
+    (3.9, 0),
+    (3.9, 2.84),
+    (3.37, 3.37),
+    (10, 10),
+    (10, 0),
+)
+_FEATURE_AREAS = {
+    "slots": 2 * polygon_area(_SLOT),
+    "center_cavities": polygon_area(_CENTER_CAVITY),
+    "center_cavities_mirrored": polygon_area(_CENTER_CAVITY),
+    "corner_cavities": polygon_area(_CORNER_CAVITY),
+    "corner_cavities_mirrored": polygon_area(_CORNER_CAVITY),
+    "edge_cavities": polygon_area(_EDGE_CAVITY),
+    "edge_cavities_mirrored": polygon_area(_EDGE_CAVITY),
+}
+
+
+def _box(num_x_rails: int, num_y_rails: int) -> np.ndarray:
+    """Get the array of a box-like rail profile."""
+    return np.ones((num_x_rails, num_y_rails), dtype=bool)
+
+
+def _c_beam(num_x_rails: int, num_y_rails: int) -> np.ndarray:
+    """Get the array of a C-beam rail profile."""
+    array = np.ones((num_x_rails, num_y_rails), dtype=bool)
+    array[1:-1, 1:] = False
+    return array
+
+
+# The rotations (as quarter turns) and mirrors of a profile, with the matrix
+# of each as applied to the (i, j) index of a cell. Mirrors flip the Y-axis.
+_ORIENTATIONS = [
+    (
+        quarter_turns,
+        mirrored,
+        np.linalg.matrix_power(np.array([[0, -1], [1, 0]]), quarter_turns)
+        @ np.diag([1, -1 if mirrored else 1]),
+    )
+    for mirrored in (False, True)
+    for quarter_turns in range(4)
+]
+
+
+class RailProfileSpec(NamedTuple):
+    """
+    A compact, hashable description of the occupied cells of a rail profile.
+
+    Specs are normalized for translation, so the empty rows and columns
+    around a profile are dropped, and two arrays of the same profile give
+    equal specs. They can be compared, hashed, pickled, or serialized with
+    :meth:`to_bytes` in a few bytes, so identical profiles can be recognized
+    without building them.
+
+    :param shape: Number of cells along the X and Y axes.
+    :param bits: The occupied cells, as the bits of an integer in row-major
+        order, starting from the least significant bit.
+    """
+
+    shape: tuple[int, int]
+    bits: int
+
+    @classmethod
+    def from_array(cls, array: ArrayLike, canonical: bool = False) -> Self:
+        """
+        Create the spec of a 2D array, where a True-like value represents the
+        presence of a rail at that grid position.
+
+        :param array: 2D boolean array representing the rail layout.
+        :param canonical: Return the canonical spec (see :meth:`canonical`).
+        """
+        array = np.asarray(array, dtype=bool)
+        occupied = np.argwhere(array)
+        if not len(occupied):
+            raise ValueError("A rail profile needs at least one occupied cell")
+        (i0, j0), (i1, j1) = occupied.min(axis=0), occupied.max(axis=0)
+        array = array[i0 : i1 + 1, j0 : j1 + 1]
+
+        packed = np.packbits(array, axis=None, bitorder="little")
+        spec = cls(array.shape, int.from_bytes(packed.tobytes(), "little"))
+        return spec.canonical() if canonical else spec
+
+    @classmethod
+    def box(cls, num_x_rails: int = 1, num_y_rails: int = 1) -> Self:
+        """Create the spec of a box-like profile of the given dimensions."""
+        return cls.from_array(_box(num_x_rails, num_y_rails))
+
+    @classmethod
+    def c_beam(cls, num_x_rails: int = 4, num_y_rails: int = 2) -> Self:
+        """Create the spec of a C-beam profile of the given dimensions."""
+        return cls.from_array(_c_beam(num_x_rails, num_y_rails))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """Read a spec written by :meth:`to_bytes`."""
+        return cls((data[0], data[1]), int.from_bytes(data[2:], "little"))
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the spec as two bytes of shape followed by the bits of the
+        cells. Profiles may be up to 255 cells along each axis.
+        """
+        x, y = self.shape
+        return bytes((x, y)) + self.bits.to_bytes((x * y + 7) // 8, "little")
+
+    def to_array(self) -> np.ndarray:
+        """Get the 2D boolean array of the occupied cells."""
+        data = np.frombuffer(self.to_bytes()[2:], dtype=np.uint8)
+        cells = np.unpackbits(
+            data, count=self.shape[0] * self.shape[1], bitorder="little"
+        )
+        return cells.reshape(self.shape).astype(bool)
+
+    def canonical(self) -> Self:
+        """
+        Get the canonical spec of the profile, which is the same for every
+        rotation and mirror image of it.
+        """
+        return type(self)(*_canonical(self)[0])
+
+
+def _orient(cells: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Transform the indices of cells and move them to start from zero."""
+    cells = cells @ matrix.T
+    return cells - cells.min(axis=0)
+
+
+def _spec(array: ArrayLike | RailProfileSpec) -> tuple[RailProfileSpec, np.ndarray]:
+    """Get the spec of an array and the index of its first occupied cell."""
+    if isinstance(array, RailProfileSpec):
+        return array, np.zeros(2, dtype=int)
+    occupied = np.argwhere(np.asarray(array, dtype=bool))
+    return RailProfileSpec.from_array(array), occupied.min(axis=0)
+
+
+# Canonical specs are cheap to keep but a sweep over random profiles can ask
+# for any number of them, so only the most recent ones are kept
+@lru_cache(maxsize=4096)
+def _canonical(spec: RailProfileSpec) -> tuple[RailProfileSpec, int, bool]:
+    """
+    Get the canonical spec of a profile, which is its orientation with the
+    smallest (shape, bits), and the quarter turns and mirror that give it.
+    """
+    cells = np.argwhere(spec.to_array())
+    candidates = []
+    for quarter_turns, mirrored, matrix in _ORIENTATIONS:
+        oriented = _orient(cells, matrix)
+        array = np.zeros(oriented.max(axis=0) + 1, dtype=bool)
+        array[tuple(oriented.T)] = True
+        oriented_spec = RailProfileSpec.from_array(array)
+        candidates.append((oriented_spec, quarter_turns, mirrored))
+    return min(candidates)
+
+
+def _classify(array: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Classify the features of each exposed cell of a rail profile.
+
+    Interior cells, which are surrounded on all four sides, are skipped. For
+    every other cell, each of the four directions gets either a slot (if the
+    neighbouring cell is empty) or a pair of cavities that join it to its
+    neighbour. Returns an array of (i, j, n) rows for each feature, where
+    90 * n is the rotation of the feature in degrees. The squares have n = 0.
+    """
+    x, y = array.shape
+    padded = np.pad(array, 1)
+
+    def _shifted(di: int, dj: int) -> np.ndarray:
+        """Get the value of the neighbour at the given offset of each cell."""
+        return padded[1 + di : 1 + di + x, 1 + dj : 1 + dj + y]
+
+    exposed = array & ~(
+        _shifted(1, 0) & _shifted(0, 1) & _shifted(-1, 0) & _shifted(0, -1)
+    )
+    features: dict[str, list[np.ndarray]] = {
+        name: []
+        for name in (
+            "slots",
+            "center_cavities",
+            "center_cavities_mirrored",
+            "corner_cavities",
+            "corner_cavities_mirrored",
+            "edge_cavities",
+            "edge_cavities_mirrored",
+        )
+    }
+
+    for n, (di, dj) in enumerate(((1, 0), (0, 1), (-1, 0), (0, -1))):
+        joined = exposed & _shifted(di, dj)
+        features["slots"].append(exposed & ~_shifted(di, dj))
+
+        # Cavities on the left of the joint and (mirrored) on the right
+        for suffix, (si, sj) in (("", (-dj, di)), ("_mirrored", (dj, -di))):
+            side = _shifted(si, sj)
+            corner = _shifted(di + si, dj + sj)
+            features["center_cavities" + suffix].append(joined & side & corner)
+            features["corner_cavities" + suffix].append(joined & side & ~corner)
+            features["edge_cavities" + suffix].append(joined & ~side)
+
+    def _indices(masks: list[np.ndarray]) -> np.ndarray:
+        """Stack the (i, j, n) indices of each direction's mask."""
+        return np.concatenate(
+            [
+                np.column_stack((np.argwhere(mask), np.full(mask.sum(), n)))
+                for n, mask in enumerate(masks)
+            ]
+        ).astype(int)
+
+    return {"squares": _indices([exposed])} | {
+        name: _indices(masks) for name, masks in features.items()
+    }
+
+
+def _outline(array: np.ndarray) -> tuple[list[Face], list[Face]]:
+    """Trace the occupied cells of an array as regions and cutouts."""
+    regions: list[Face] = []
+    cutouts: list[Face] = []
+    for loop in outline(array):
+        points = [(20 * a - 10, 20 * b - 10) for a, b in loop]
+        if signed_area(loop) > 0:
+            regions.append(Face(Wire.make_polygon(points)))
+        else:
+            cutouts.append(Face(Wire.make_polygon(points[::-1])))
+    return regions, cutouts
+
+
+def _rail_profile(spec: RailProfileSpec, detail: Detail) -> Sketch:
+    """
+    Get the geometry of a rail profile. Every rotation and mirror image of a
+    profile is made from the same cached geometry of its canonical spec.
+    """
+    canonical, quarter_turns, mirrored = _canonical(spec)
+    profile = _canonical_rail_profile(canonical, detail)
+    if (quarter_turns, mirrored) == (0, False):
+        return profile
+
+    # The canonical profile is this one mirrored and then turned. Turning
+    # back then mirroring is the same as mirroring then turning forwards.
+    if mirrored:
+        profile = profile.mirror(Plane.XZ)
+    angle = 90 * quarter_turns if mirrored else -90 * quarter_turns
+    matrix = np.linalg.inv(_ORIENTATIONS[quarter_turns + 4 * mirrored][2])
+    offset = -(np.argwhere(canonical.to_array()) @ matrix.T).min(axis=0)
+    return profile.moved(Location(Vector(*(20 * offset).tolist()), angle))
+
+
+@cached(profile_cache)
+def _canonical_rail_profile(spec: RailProfileSpec, detail: Detail) -> Sketch:
+    """Build the geometry of a rail profile with the given occupied cells."""
+    array = spec.to_array()
+    if detail is not Detail.FULL:
+        return _plain_rail_profile(array, detail)
+
+    with stage("classify"):
+        features = _classify(array)
+        exposed = np.zeros_like(array)
+        exposed[tuple(features["squares"][:, :2].T)] = True
+        locations = {
+            name: [
+                Location(Vector(20 * i, 20 * j), 90 * n) for i, j, n in rows.tolist()
+            ]
+            for name, rows in features.items()
+        }
+
+    with stage("features"):
+        with BuildSketch() as slot:
+            with BuildLine():
+                Polyline(*_SLOT)
+                mirror(about=Plane.XZ)
+            make_face()
+
+        with BuildSketch() as edge_cavity:
+            with BuildLine():
+                Polyline(*_EDGE_CAVITY)
+            make_face()
+
+        with BuildSketch() as corner_cavity:
+            with BuildLine():
+                Polyline(*_CORNER_CAVITY)
+            make_face()
+
+        with BuildSketch() as center_cavity:
+            with BuildLine():
+                Polyline(*_CENTER_CAVITY)
+            make_face()
+
+    # The exposed cells are traced as polygons so that they don't need to be
+    # fused, then every hole, slot and cavity is cut out in a single boolean.
+    # Shapes are made directly rather than as builder objects, which would be
+    # added to the caller's builder when the profile is built inside one.
+    with stage("outline"):
+        regions, holes = _outline(exposed)
+        cutouts: list[Face | Sketch] = list(holes)
+        for sketch, name in (
+            (Face(Wire.make_circle(_HOLE_RADIUS)), "squares"),
+            (slot.sketch, "slots"),
+            (center_cavity.sketch, "center_cavities"),
+            (center_cavity.sketch.mirror(Plane.XZ), "center_cavities_mirrored"),
+            (corner_cavity.sketch, "corner_cavities"),
+            (corner_cavity.sketch.mirror(Plane.XZ), "corner_cavities_mirrored"),
+            (edge_cavity.sketch, "edge_cavities"),
+            (edge_cavity.sketch.mirror(Plane.XZ), "edge_cavities_mirrored"),
+        ):
+            cutouts.extend(sketch.moved(location) for location in locations[name])
+
+    with stage("cut"), BuildSketch() as profile:
+        add(regions)
+        add(cutouts, mode=Mode.SUBTRACT)
+
+    return profile.sketch
+
+
+def _plain_rail_profile(array: np.ndarray, detail: Detail) -> Sketch:
+    """
+    Build a rail profile without any slots, cavities or holes. The envelope
+    is the rectangle that bounds the occupied cells.
+    """
+    if detail is Detail.ENVELOPE:
+        occupied = np.argwhere(array)
+        (i0, j0), (i1, j1) = occupied.min(axis=0), occupied.max(axis=0)
+        array = np.zeros_like(array)
+        array[i0 : i1 + 1, j0 : j1 + 1] = True
+
+    with stage("outline"):
+        regions, cutouts = _outline(array)
+
+    with stage("cut"), BuildSketch() as profile:
+        add(regions)
+        if cutouts:
+            add(cutouts, mode=Mode.SUBTRACT)
+
+    return profile.sketch
+
 
 class VSlot2020RailProfile(BaseSketchObject):
     """
@@ -30,201 +414,344 @@ class VSlot2020RailProfile(BaseSketchObject):
     the correct V-Slot profile. True-like positions that are adjacent to other
     True-like positions will be joined without slots.
 
-    :param array: 2D boolean array representing the rail layout.
+    :param array: 2D boolean array representing the rail layout, or its
+        :class:`RailProfileSpec`.
+    :param detail: Level of detail of the profile. SIMPLIFIED is the outline
+        of the occupied cells and ENVELOPE is their bounding rectangle, both
+        without slots, cavities or holes. Default: FULL.
     """
 
+    @profiled
     def __init__(
         self,
-        array: ArrayLike,
+        array: ArrayLike | RailProfileSpec,
+        detail: Detail | str = Detail.FULL,
         *,
         rotation: float = 0,
         align: Align2D = None,
         mode: Mode = Mode.ADD,
     ):
-        array = np.asarray(array, dtype=bool)
-        x, y = array.shape
-
-        def _get(i: int, j: int) -> bool:
-            """Get the value at the given indices or False if out of bounds."""
-            return in_bounds(array, i, j) and array[i, j]
-
-        squares: list[Location] = []
-        slots: list[Location] = []
-        center_cavities: list[Location] = []
-        center_cavities_mirrored: list[Location] = []
-        corner_cavities: list[Location] = []
-        corner_cavities_mirrored: list[Location] = []
-        edge_cavities: list[Location] = []
-        edge_cavities_mirrored: list[Location] = []
-
-        for i, j in product(range(x), range(y)):
-            if not array[i, j]:
-                continue
-            if all(map(_get, (i + 1, i, i - 1, i), (j, j + 1, j, j - 1))):
-                continue
-
-            translation = Vector(20 * i, 20 * j)
-            squares.append(Location(translation))
-
-            for n, (di, dj) in enumerate(((1, 0), (0, 1), (-1, 0), (0, -1))):
-                location = Location(translation, 90 * n)
-                if _get(i + di, j + dj):
-                    if di:
-                        if _get(i, j + di):
-                            if _get(i + di, j + di):
-                                center_cavities.append(location)
-                            else:
-                                corner_cavities.append(location)
-                        else:
-                            edge_cavities.append(location)
-                        if _get(i, j - di):
-                            if _get(i + di, j - di):
-                                center_cavities_mirrored.append(location)
-                            else:
-                                corner_cavities_mirrored.append(location)
-                        else:
-                            edge_cavities_mirrored.append(location)
-                    else:
-                        if _get(i + dj, j):
-                            if _get(i + dj, j + dj):
-                                center_cavities_mirrored.append(location)
-                            else:
-                                corner_cavities_mirrored.append(location)
-                        else:
-                            edge_cavities_mirrored.append(location)
-                        if _get(i - dj, j):
-                            if _get(i - dj, j + dj):
-                                center_cavities.append(location)
-                            else:
-                                corner_cavities.append(location)
-                        else:
-                            edge_cavities.append(location)
-                else:
-                    slots.append(location)
-
-        with BuildSketch() as slot:
-            with BuildLine():
-                Polyline(
-                    (3.75, 0),
-                    (3.9, 0.15),
-                    (3.9, 2.84),
-                    (6.56, 5.5),
-                    (8.2, 5.5),
-                    (8.2, 3.125),
-                    (8.545, 3.125),
-                    (10, 4.58),
-                    (10, 0),
-                )
-                mirror(about=Plane.XZ)
-            make_face()
-
-        with BuildSketch() as edge_cavity:
-            with BuildLine():
-                Polyline(
-                    (10, 0),
-                    (3.9, 0),
-                    (3.9, 3.16),
-                    (7.3, 6.56),
-                    (7.3, 8.2),
-                    (10, 8.2),
-                    (10, 0),
-                )
-            make_face()
+        spec, offset = _spec(array)
+        profile = _rail_profile(spec, Detail(detail))
+        if offset.any():
+            profile = profile.moved(Location(Vector(*(20 * offset).tolist())))
+        with stage("place"):
+            super().__init__(profile, rotation, align, mode)
 
-        with BuildSketch() as corner_cavity:
-            with BuildLine():
-                Polyline(
-                    (10, 0),
-                    (3.9, 0),
-                    (3.9, 2.84),
-                    (9.26, 8.2),
-                    (10, 8.2),
-                    (10, 0),
-                )
-            make_face()
-
-        with BuildSketch() as center_cavity:
-            with BuildLine():
-                Polyline(
-                    (10, 0),
-                    (3.9, 0),
-                    (3.9, 2.84),
-                    (3.37, 3.37),
-                    (10, 10),
-                    (10, 0),
-                )
-            make_face()
-
-        with BuildSketch() as profile:
-            with LocationList(squares):
-                Rectangle(20, 20)
-                Circle(2.1, mode=Mode.SUBTRACT)
-            with LocationList(slots):
-                add(slot.face(), mode=Mode.SUBTRACT)
-            with LocationList(center_cavities):
-                add(center_cavity.face(), mode=Mode.SUBTRACT)
-            with LocationList(center_cavities_mirrored):
-                add(center_cavity.face().mirror(Plane.XZ), mode=Mode.SUBTRACT)
-            with LocationList(corner_cavities):
-                add(corner_cavity.face(), mode=Mode.SUBTRACT)
-            with LocationList(corner_cavities_mirrored):
-                add(corner_cavity.face().mirror(Plane.XZ), mode=Mode.SUBTRACT)
-            with LocationList(edge_cavities):
-                add(edge_cavity.face(), mode=Mode.SUBTRACT)
-            with LocationList(edge_cavities_mirrored):
-                add(edge_cavity.face().mirror(Plane.XZ), mode=Mode.SUBTRACT)
-
-        super().__init__(profile.sketch, rotation, align, mode)
+    @staticmethod
+    def preload(
+        arrays: Iterable[ArrayLike | RailProfileSpec],
+        detail: Detail | str = Detail.FULL,
+    ) -> None:
+        """
+        Build and cache the profiles of the given arrays ahead of time.
+        """
+        for array in arrays:
+            _rail_profile(_spec(array)[0], Detail(detail))
 
     @classmethod
-    def box(cls, num_x_rails: int = 1, num_y_rails: int = 1) -> Self:
+    def box(
+        cls,
+        num_x_rails: int = 1,
+        num_y_rails: int = 1,
+        detail: Detail | str = Detail.FULL,
+    ) -> Self:
         """
         Create a box-like V-Slot 2020 rail profile of the given dimensions.
         """
-        array = np.ones((num_x_rails, num_y_rails), dtype=bool)
-        return cls(array)
+        return cls(RailProfileSpec.box(num_x_rails, num_y_rails), detail)
 
     @classmethod
-    def c_beam(cls, num_x_rails: int = 4, num_y_rails: int = 2) -> Self:
+    def c_beam(
+        cls,
+        num_x_rails: int = 4,
+        num_y_rails: int = 2,
+        detail: Detail | str = Detail.FULL,
+    ) -> Self:
         """
         Create a C-beam V-Slot 2020 rail profile of the given dimensions.
         """
-        array = np.ones((num_x_rails, num_y_rails), dtype=bool)
-        array[1:-1, 1:] = False
-        return cls(array)
+        return cls(RailProfileSpec.c_beam(num_x_rails, num_y_rails), detail)
+
+
+def _rail_metadata(
+    array: np.ndarray,
+    length: float,
+    detail: Detail,
+    density: float,
+) -> Metadata:
+    """
+    Compute the metadata of a rail from its array of occupied cells.
+
+    Interior cells are hollow, so at full detail only the exposed cells are
+    solid. Every hole, slot and cavity lies within its own cell and no two
+    overlap, so the area of the profile is the area of the exposed cells
+    minus the area of each feature.
+    """
+    occupied = np.argwhere(array)
+    (i0, j0), (i1, j1) = occupied.min(axis=0).tolist(), occupied.max(axis=0).tolist()
+
+    if detail is Detail.ENVELOPE:
+        area = 400 * (i1 - i0 + 1) * (j1 - j0 + 1)
+        holes: tuple[HoleInfo, ...] = ()
+    elif detail is Detail.SIMPLIFIED:
+        area = 400 * len(occupied)
+        holes = ()
+    else:
+        features = _classify(array)
+        area = (
+            400 * len(features["squares"])
+            - len(features["squares"]) * pi * _HOLE_RADIUS**2
+            - sum(len(features[name]) * a for name, a in _FEATURE_AREAS.items())
+        )
+        holes = tuple(
+            HoleInfo((20 * i, 20 * j, 0), (0, 0, 1), _HOLE_RADIUS)
+            for i, j, _ in features["squares"].tolist()
+        )
+
+    volume = area * length
+    return Metadata(
+        volume,
+        volume * density,
+        ((20 * i0 - 10, 20 * j0 - 10, 0), (20 * i1 + 10, 20 * j1 + 10, length)),
+        holes,
+    )
+
 
+def _rail_spec(num_x_rails: int, num_y_rails: int, c_beam: bool) -> RailProfileSpec:
+    """Get the spec of a box-like or C-beam rail profile."""
+    if c_beam:
+        return RailProfileSpec.c_beam(num_x_rails, num_y_rails)
+    return RailProfileSpec.box(num_x_rails, num_y_rails)
 
-class VSlot2020Rail(BasePartObject):
+
+def _rail_joints(length: float) -> dict[str, Location]:
+    """Get the locations of the joints at the ends of a rail."""
+    return {
+        "A": Location((0, 0, length), (0, 0, 0)),
+        "B": Location((0, 0, 0), (180, 0, 0)),
+    }
+
+
+@disk_cached(disk_cache)
+def _rail(length: float, spec: RailProfileSpec, detail: Detail) -> Part:
+    """Build the geometry of a rail with the given dimensions."""
+    profile = VSlot2020RailProfile(spec, detail)
+
+    # The profile is swept directly, rather than in a builder, which would
+    # copy and clean the solid several times over
+    with stage("extrude"):
+        prism = BRepPrimAPI_MakePrism(profile.wrapped, gp_Vec(0, 0, length))
+        return Part(downcast(prism.Shape()))
+
+
+class VSlot2020Rail(BasePartObject, MeshMixin):
     """
     A 2020 V-Slot rail.
 
+    The geometry can be persisted between processes by enabling the disk
+    cache (see :mod:`bd_vslot.cache`).
+
     :param length: Length of the rail.
     :param num_x_rails: Number of rails along the X-axis.
     :param num_y_rails: Number of rails along the Y-axis.
     :param c_beam: Whether to create a C-beam profile. If False,
         a box-like profile will be created. Default: False.
+    :param detail: Level of detail of the profile (see
+        :class:`VSlot2020RailProfile`). Default: FULL.
+    :param profile: The profile of the rail, instead of ``num_x_rails``,
+        ``num_y_rails`` and ``c_beam``.
     """
 
+    @profiled
     def __init__(
         self,
         length: float,
         num_x_rails: int = 1,
         num_y_rails: int = 1,
         c_beam: bool = False,
+        detail: Detail | str = Detail.FULL,
         *,
+        profile: RailProfileSpec | None = None,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
     ):
-        with BuildPart() as rail:
-            with BuildSketch():
-                if c_beam:
-                    VSlot2020RailProfile.c_beam(num_x_rails, num_y_rails)
-                else:
-                    VSlot2020RailProfile.box(num_x_rails, num_y_rails)
-            extrude(amount=length)
-
-            RigidJoint("A", joint_location=Location((0, 0, length), (0, 0, 0)))
-            RigidJoint("B", joint_location=Location((0, 0, 0), (180, 0, 0)))
-
-        super().__init__(rail.part, rotation, align, mode)
+        spec = profile or _rail_spec(num_x_rails, num_y_rails, c_beam)
+        part = _rail(length, spec, Detail(detail))
+        for name, location in _rail_joints(length).items():
+            RigidJoint(name, part, location)
+
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
+
+        # Kept so that rails can be checked for clearance without their
+        # geometry (see bd_vslot.clearance)
+        self.length = length
+        self.profile_spec = spec
+        self.detail = Detail(detail)
+
+    @staticmethod
+    def estimate(
+        length: float,
+        num_x_rails: int = 1,
+        num_y_rails: int = 1,
+        c_beam: bool = False,
+        detail: Detail | str = Detail.FULL,
+        density: float = ALUMINIUM_DENSITY,
+        *,
+        profile: RailProfileSpec | None = None,
+    ) -> Metadata:
+        """
+        Compute the metadata of a rail without building it.
+
+        See :mod:`bd_vslot.metadata`. Takes the same arguments as the
+        constructor, plus the density of the material in grams per cubic
+        millimeter.
+        """
+        spec = profile or _rail_spec(num_x_rails, num_y_rails, c_beam)
+        return _rail_metadata(spec.to_array(), length, Detail(detail), density)
+
+    @classmethod
+    def many(
+        cls,
+        lengths: ArrayLike,
+        locations: Iterable[Location | ArrayLike] | None = None,
+        num_x_rails: int = 1,
+        num_y_rails: int = 1,
+        c_beam: bool = False,
+        detail: Detail | str = Detail.FULL,
+        *,
+        profile: RailProfileSpec | Sequence[RailProfileSpec] | None = None,
+        assembly: Assembly | None = None,
+    ) -> Assembly:
+        """
+        Add many rails to an assembly in one call. Each rail of a unique
+        length and profile is built once, and every other rail shares its
+        geometry (see :mod:`bd_vslot.assembly`).
+
+        :param lengths: The length of each rail.
+        :param locations: The location of each rail, as a Location or as the
+            (4, 4) or (3, 4) matrix of a rigid transformation. Default: the
+            origin.
+        :param profile: The profile of every rail, or of each rail, instead
+            of ``num_x_rails``, ``num_y_rails`` and ``c_beam``.
+        :param assembly: The assembly to add the rails to. Default: a new
+            assembly.
+        :return: The assembly, with one instance per rail, in order.
+        """
+        lengths = np.asarray(lengths, dtype=float).ravel().tolist()
+        if profile is None or isinstance(profile, RailProfileSpec):
+            specs = [profile or _rail_spec(num_x_rails, num_y_rails, c_beam)]
+            specs *= len(lengths)
+        else:
+            specs = list(profile)
+        if locations is None:
+            placements = [Location()] * len(lengths)
+        else:
+            placements = [
+                value if isinstance(value, Location) else _location(value)
+                for value in locations
+            ]
+        if not len(lengths) == len(specs) == len(placements):
+            raise ValueError(
+                f"Got {len(lengths)} lengths, {len(specs)} profiles and "
+                f"{len(placements)} locations"
+            )
+
+        detail = Detail(detail)
+        assembly = assembly if assembly is not None else Assembly()
+        for length, spec, location in zip(lengths, specs, placements):
+            assembly.add(cls, length, detail=detail, profile=spec, location=location)
+        return assembly
+
+
+def _location(matrix: ArrayLike) -> Location:
+    """Get the location of a (4, 4) or (3, 4) rigid transformation matrix."""
+    values = np.asarray(matrix, dtype=float)[:3].ravel().tolist()
+    transformation = gp_Trsf()
+    transformation.SetValues(*values)
+    return Location(transformation)
+
+
+class LazyRail:
+    """
+    A 2020 V-Slot rail that is only built when its geometry is needed.
+
+    Only the length and profile of the rail are stored, so a frame of
+    thousands of rails can be laid out by their joints and bounding boxes
+    without building any of them. The solid is built on the first call to
+    :meth:`part`, and kept in :data:`~bd_vslot.cache.rail_cache`, where
+    rails of the same dimensions share it. The least recently used solids
+    are dropped from the cache once it is full, or when it is cleared, and
+    are built again (or loaded from the disk cache) when next needed.
+
+    Takes the same arguments as :class:`VSlot2020Rail`, plus its location.
+
+    :param location: Location of the rail. Default: the origin.
+    """
+
+    def __init__(
+        self,
+        length: float,
+        num_x_rails: int = 1,
+        num_y_rails: int = 1,
+        c_beam: bool = False,
+        detail: Detail | str = Detail.FULL,
+        *,
+        profile: RailProfileSpec | None = None,
+        location: Location | None = None,
+    ):
+        self.length = length
+        self.profile_spec = profile or _rail_spec(num_x_rails, num_y_rails, c_beam)
+        self.detail = Detail(detail)
+        self.location = location or Location()
+
+    def __repr__(self) -> str:
+        return (
+            f"LazyRail({self.length}, detail={self.detail}, "
+            f"profile={self.profile_spec}, location={self.location})"
+        )
+
+    @property
+    def joints(self) -> dict[str, Location]:
+        """The locations of the rail's joints, relative to the rail."""
+        return _rail_joints(self.length)
+
+    def joint_location(self, name: str) -> Location:
+        """Get the location of one of the rail's joints."""
+        return self.location * self.joints[name]
+
+    def bounding_box(self) -> BoundBox:
+        """Get the bounding box of the rail, without building it."""
+        x, y = self.profile_spec.shape
+        box = Bnd_Box(
+            gp_Pnt(-10, -10, 0), gp_Pnt(20 * x - 10, 20 * y - 10, self.length)
+        )
+        return BoundBox(box.Transformed(self.location.wrapped.Transformation()))
+
+    def estimate(self, density: float = ALUMINIUM_DENSITY) -> Metadata:
+        """
+        Compute the metadata of the rail, at the origin, without building it.
+        See :meth:`VSlot2020Rail.estimate`.
+        """
+        return VSlot2020Rail.estimate(
+            self.length, detail=self.detail, density=density, profile=self.profile_spec
+        )
+
+    def part(self) -> VSlot2020Rail:
+        """
+        Get the rail at its location, building it if it isn't cached. The
+        rail shares its geometry with the cached solid.
+        """
+        key = (self.length, self.profile_spec, self.detail)
+        part = copy.copy(
+            rail_cache.get(
+                key,
+                lambda: VSlot2020Rail(
+                    self.length, detail=self.detail, profile=self.profile_spec
+                ),
+            )
+        )
+        part.move(self.location)
+        return part
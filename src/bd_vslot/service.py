@@ -0,0 +1,220 @@
+"""
+Building parts from asyncio code, such as a web server.
+
+Building a part can take seconds of CPU time, which would block the event
+loop of a server that built it directly. A :class:`BuildService` runs builds
+in a pool of processes instead, so that the event loop stays responsive:
+
+.. code-block:: python
+
+    from bd_vslot import VSlot2020Rail
+    from bd_vslot.service import build_async
+
+    rail = await build_async(VSlot2020Rail, length=500, timeout=30)
+
+Identical requests that arrive while a part is being built share a single
+build. The number of distinct builds that may be queued or running at once
+is bounded, and requests beyond it fail fast with :class:`asyncio.QueueFull`
+so that a server can shed load rather than queue without limit.
+"""
+
+import asyncio
+import copy
+import copyreg
+import io
+import os
+import pickle
+from collections.abc import Callable, Hashable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from build123d import Part
+from build123d.topology import downcast
+from OCP.BRep import BRep_Builder  # type: ignore[import-untyped]
+from OCP.BRepTools import BRepTools  # type: ignore[import-untyped]
+from OCP.gp import gp_Trsf  # type: ignore[import-untyped]
+from OCP.TopLoc import TopLoc_Location  # type: ignore[import-untyped]
+from OCP.TopoDS import TopoDS_Shape  # type: ignore[import-untyped]
+
+P = TypeVar("P", bound=Part)
+
+
+def _read_shape(data: bytes) -> TopoDS_Shape:
+    """Read a shape written by _reduce_shape."""
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    return downcast(shape)
+
+
+def _reduce_shape(shape: TopoDS_Shape) -> tuple[Callable, tuple]:
+    """Pickle a shape as a text BREP."""
+    data = io.BytesIO()
+    BRepTools.Write_s(shape, data)
+    return _read_shape, (data.getvalue(),)
+
+
+def _read_location(values: tuple[float, ...]) -> TopLoc_Location:
+    """Read a location written by _reduce_location."""
+    transformation = gp_Trsf()
+    transformation.SetValues(*values)
+    return TopLoc_Location(transformation)
+
+
+def _reduce_location(location: TopLoc_Location) -> tuple[Callable, tuple]:
+    """Pickle a location as the 12 values of its transformation matrix."""
+    transformation = location.Transformation()
+    values = [transformation.Value(i, j) for i in range(1, 4) for j in range(1, 5)]
+    return _read_location, (tuple(values),)
+
+
+# build123d pickles shapes as binary BREPs, which OCCT can't always read
+# back, and locations as single-precision floats. Parts are sent from the
+# workers as text BREPs and exact matrices instead.
+_DISPATCH_TABLE = copyreg.dispatch_table.copy()
+_DISPATCH_TABLE[TopLoc_Location] = _reduce_location
+for _cls in (TopoDS_Shape, *TopoDS_Shape.__subclasses__()):
+    _DISPATCH_TABLE[_cls] = _reduce_shape
+
+
+def _build(part_class: Callable[..., Part], args: tuple, kwargs: dict) -> bytes:
+    """Build a part and pickle it. Used by the process pool."""
+    part = part_class(*args, **kwargs)
+    data = io.BytesIO()
+    pickler = pickle.Pickler(data, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _DISPATCH_TABLE
+    pickler.dump(part)
+    return data.getvalue()
+
+
+class _Build:
+    """A build in progress and the number of requests waiting for it."""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class BuildService:
+    """
+    Builds parts in a pool of processes for asyncio code.
+
+    Cancelling a request, or letting it time out, cancels its build once no
+    other request is waiting for it. A build that has already started in a
+    worker process runs to completion there and its result is discarded.
+
+    :param workers: The number of processes. Default: the number of CPUs.
+    :param max_pending: The maximum number of distinct builds that may be
+        queued or running at once.
+    :param timeout: The default time in seconds to wait for each request.
+        Default: no limit.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_pending: int = 64,
+        timeout: float | None = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._builds: dict[Hashable, _Build] = {}
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def __aenter__(self) -> "BuildService":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """The number of distinct builds that are queued or running."""
+        return len(self._builds)
+
+    async def build(
+        self,
+        part_class: Callable[..., P],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> P:
+        """
+        Build a part in a worker process.
+
+        :param part_class: The class of the part, such as VSlot2020Rail.
+        :param args: Positional arguments of the part, which must be
+            hashable and picklable.
+        :param timeout: The time in seconds to wait for the part, after which
+            :class:`TimeoutError` is raised. Default: the service's timeout.
+        :param kwargs: Keyword arguments of the part.
+        :raises asyncio.QueueFull: If too many builds are already pending.
+        """
+        key = (part_class, args, tuple(sorted(kwargs.items())))
+        build = self._builds.get(key)
+        if build is None:
+            if len(self._builds) >= self.max_pending:
+                raise asyncio.QueueFull(f"{len(self._builds)} builds are pending")
+            future = asyncio.ensure_future(self._run(part_class, args, kwargs))
+            build = self._builds[key] = _Build(future)
+            future.add_done_callback(lambda _: self._forget(key, build))
+
+        build.waiters += 1
+        try:
+            part = await asyncio.wait_for(
+                asyncio.shield(build.future),
+                timeout if timeout is not None else self.timeout,
+            )
+        finally:
+            build.waiters -= 1
+            if not build.waiters:
+                build.future.cancel()
+                self._forget(key, build)
+
+        # Each request gets its own copy, which shares the built geometry
+        return copy.copy(part)
+
+    async def _run(
+        self, part_class: Callable[..., P], args: tuple, kwargs: dict[str, Any]
+    ) -> P:
+        """Build a part in the pool, then unpickle it in a thread."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        data = await asyncio.wrap_future(
+            self._executor.submit(_build, part_class, args, kwargs)
+        )
+        return await asyncio.to_thread(pickle.loads, data)
+
+    def _forget(self, key: Hashable, build: _Build) -> None:
+        """Remove a finished build, unless it has already been replaced."""
+        if self._builds.get(key) is build:
+            del self._builds[key]
+
+    def close(self) -> None:
+        """Cancel the queued builds and shut down the worker processes."""
+        for build in self._builds.values():
+            build.future.cancel()
+        self._builds.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# The service used by build_async, created on first use
+_service: BuildService | None = None
+
+
+async def build_async(
+    part_class: Callable[..., P],
+    *args: Any,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> P:
+    """
+    Build a part in a worker process of a shared :class:`BuildService`.
+    See :meth:`BuildService.build`.
+    """
+    global _service
+    if _service is None:
+        _service = BuildService()
+    return await _service.build(part_class, *args, timeout=timeout, **kwargs)
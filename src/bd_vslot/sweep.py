@@ -0,0 +1,346 @@
+"""
+Sweeps of parts over grids of parameters.
+
+A sweep builds a part for every combination of the given parameter values and
+measures each one, to search a design space for, say, the lightest plate that
+is thick enough and has enough holes:
+
+.. code-block:: python
+
+    from bd_vslot import BoltSize, BuildPlate
+    from bd_vslot.sweep import sweep, write_rows
+
+    rows = sweep(
+        BuildPlate,
+        thickness=[2, 3, 4, 5],
+        num_x_holes=range(4, 12),
+        num_y_holes=range(4, 12),
+        hole_radius=[BoltSize.M3, BoltSize.M5],
+        chamfer_size=[0, 0.5],
+    )
+    write_rows(rows, "plates.csv")
+
+Points that share a profile, and differ only in thickness or chamfer, are
+built together in one process so that the profile is only built once (see
+:mod:`bd_vslot.cache`). Rows are yielded as they are built, and
+:func:`write_rows` streams them to a CSV or Parquet file, so a sweep of
+thousands of variants never holds them all in memory. Writing Parquet files
+requires the ``sweep`` extra (``pip install bd-vslot[sweep]``).
+
+Parts with an ``estimate`` method can also be swept without building them at
+all (``build=False``), using their analytic metadata, which takes about a
+millisecond per point rather than a fraction of a second or more. This is
+useful to prune a design space before building the candidates that remain.
+"""
+
+import csv
+import os
+from collections import defaultdict, deque
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from functools import partial
+from itertools import islice, product
+from numbers import Integral, Real
+from os import PathLike
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from bd_vslot.batch import part_class as find_part_class
+from bd_vslot.constants import ALUMINIUM_DENSITY
+
+# Parameters that don't change the profile of a plate, which is shared by
+# every point that differs only in these
+_PROFILE_FREE = ("thickness", "chamfer_size")
+
+# The types of the columns of every sweep, whatever the part. The metrics are
+# None, and the error a string, in the rows of parts that failed to build.
+_SWEEP_COLUMNS: dict[str, type] = {
+    "volume": float,
+    "mass": float,
+    "size_x": float,
+    "size_y": float,
+    "size_z": float,
+    "seconds": float,
+    "error": str,
+}
+
+# The type of a column of values of each kind, checked in order, as bool is
+# an int
+_KINDS: tuple[tuple[type, type], ...] = (
+    (bool, bool),
+    (Integral, int),
+    (Real, float),
+    (str, str),
+)
+
+Row = dict[str, Any]
+
+
+def grid(**axes: Iterable[Any]) -> list[dict[str, Any]]:
+    """
+    Get every combination of the given parameter values, with the last
+    parameter changing fastest.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in product(*map(list, axes.values()))]
+
+
+def _value(value: Any) -> Any:
+    """Convert a parameter to a value that can be written to a file."""
+    return value.name if isinstance(value, Enum) else value
+
+
+def _measure_point(
+    part_class: Any,
+    params: Mapping[str, Any],
+    build: bool,
+    density: float,
+    measure: Callable[[Any], Mapping[str, Any]] | None,
+) -> Row:
+    """Build or estimate a single part and measure it."""
+    row: Row = {name: _value(value) for name, value in params.items()}
+    row |= dict.fromkeys(("volume", "mass", "size_x", "size_y", "size_z"))
+    start = perf_counter()
+    try:
+        if build:
+            part = part_class(**params)
+            box = part.bounding_box()
+            volume = part.volume
+            row |= {
+                "volume": volume,
+                "mass": volume * density,
+                "size_x": box.size.X,
+                "size_y": box.size.Y,
+                "size_z": box.size.Z,
+            }
+            result: Any = part
+        else:
+            result = part_class.estimate(**params, density=density)
+            (x0, y0, z0), (x1, y1, z1) = result.bounding_box
+            row |= {
+                "volume": result.volume,
+                "mass": result.mass,
+                "size_x": x1 - x0,
+                "size_y": y1 - y0,
+                "size_z": z1 - z0,
+            }
+        if measure is not None:
+            row |= measure(result)
+        row |= {"seconds": perf_counter() - start, "error": None}
+    except Exception as e:
+        row |= {"seconds": perf_counter() - start, "error": f"{type(e).__name__}: {e}"}
+    return row
+
+
+def _measure_chunk(
+    points: list[dict[str, Any]],
+    part_class: Any,
+    build: bool,
+    density: float,
+    measure: Callable[[Any], Mapping[str, Any]] | None,
+) -> list[Row]:
+    """Measure a chunk of points. Used by the process pool."""
+    return [
+        _measure_point(part_class, params, build, density, measure) for params in points
+    ]
+
+
+def _chunks(points: list[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    """
+    Split points into chunks of at most the given size, where each chunk
+    only has points of a single profile.
+    """
+    groups: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+    for params in points:
+        key = tuple(
+            (name, value)
+            for name, value in sorted(params.items())
+            if name not in _PROFILE_FREE
+        )
+        groups[key].append(params)
+    for group in groups.values():
+        iterator = iter(group)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+
+def iter_sweep(
+    part_class: type | str,
+    points: Iterable[Mapping[str, Any]],
+    *,
+    build: bool = True,
+    density: float = ALUMINIUM_DENSITY,
+    measure: Callable[[Any], Mapping[str, Any]] | None = None,
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> Iterator[Row]:
+    """
+    Measure a part at each of the given points across a pool of processes.
+
+    Each row has the parameters of a point, the volume, mass and bounding box
+    size of the part, any values returned by ``measure``, the time taken and
+    an error, which is None unless the part failed to build. The volume, mass
+    and size of a part that failed are None, and it has no values from
+    ``measure``. Enum parameters, such as :class:`~bd_vslot.BoltSize`, are
+    given by name.
+
+    :param part_class: The class of the part, or its name.
+    :param points: The parameters of each part.
+    :param build: Build each part. If False, use the part's ``estimate``
+        method instead, which is fast enough to run in this process.
+    :param density: Density of the material in grams per cubic millimeter.
+    :param measure: A function that takes the part (or its
+        :class:`~bd_vslot.metadata.Metadata` if not building) and returns
+        more values for its row. It must be picklable, such as a function
+        defined at the top level of a module.
+    :param workers: The number of processes. If 1, parts are built in this
+        process. Default: the number of CPUs.
+    :param chunksize: The most points sent to a process at a time. Default:
+        enough to give each process several chunks.
+    :return: The row of each point, grouped by profile.
+    """
+    if isinstance(part_class, str):
+        part_class = find_part_class(part_class)
+    params = [dict(point) for point in points]
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(params) // (4 * workers))
+
+    measure_chunk = partial(
+        _measure_chunk,
+        part_class=part_class,
+        build=build,
+        density=density,
+        measure=measure,
+    )
+    chunks = _chunks(params, chunksize)
+    if workers == 1 or not build:
+        for chunk in chunks:
+            yield from measure_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[list[Row]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(measure_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def sweep(
+    part_class: type | str,
+    *,
+    build: bool = True,
+    density: float = ALUMINIUM_DENSITY,
+    measure: Callable[[Any], Mapping[str, Any]] | None = None,
+    workers: int | None = None,
+    **axes: Iterable[Any],
+) -> Iterator[Row]:
+    """
+    Measure a part at every combination of the given parameter values.
+    See :func:`iter_sweep`.
+
+    :param axes: The values of each parameter of the part. Parameters with
+        a single value may be given as a one-element list.
+    """
+    return iter_sweep(
+        part_class,
+        grid(**axes),
+        build=build,
+        density=density,
+        measure=measure,
+        workers=workers,
+    )
+
+
+def _column_type(name: str, batch: list[Row]) -> type:
+    """Get the type of a column from the first of its values that isn't None."""
+    if name in _SWEEP_COLUMNS:
+        return _SWEEP_COLUMNS[name]
+    for row in batch:
+        value = row.get(name)
+        for kind, column_type in _KINDS:
+            if isinstance(value, kind):
+                return column_type
+        if value is not None:
+            raise TypeError(f"Column {name!r} has a value of type {type(value)}")
+    raise ValueError(
+        f"Column {name!r} is empty in the first batch of rows, so its type is "
+        f"unknown. Give the columns to write_rows."
+    )
+
+
+def _check_columns(batch: list[Row], columns: Collection[str]) -> None:
+    """Check that every row of a batch only has the given columns."""
+    for row in batch:
+        if extra := set(row).difference(columns):
+            raise ValueError(
+                f"A row has columns that aren't being written: "
+                f"{', '.join(sorted(extra))}"
+            )
+
+
+def write_rows(
+    rows: Iterable[Row],
+    path: str | PathLike,
+    batch_size: int = 1024,
+    columns: Mapping[str, type] | Sequence[str] | None = None,
+) -> int:
+    """
+    Stream rows to a CSV or Parquet file, by the file's extension.
+
+    The columns, and their types in a Parquet file, are fixed before the
+    first row is written. By default they are the columns of the first batch
+    of rows, and in a Parquet file each column has the type of its first
+    value, except that the volume, mass, size and time of a sweep are floats
+    and its error is a string. If the first batch might not have every
+    column, such as a sweep with ``measure`` where all of the first parts
+    failed to build, give the columns explicitly.
+
+    :param rows: The rows to write, such as those of a sweep. A missing
+        value is written as empty (or null).
+    :param path: The file to write, ending in ``.csv`` or ``.parquet``.
+    :param batch_size: The number of rows written at a time.
+    :param columns: The names of the columns, or the type of each one as
+        bool, int, float or str.
+    :return: The number of rows written.
+    :raises ValueError: If a row has a column that isn't being written.
+    """
+    path = Path(path)
+    if path.suffix not in (".csv", ".parquet"):
+        raise ValueError(f"Unknown format: {path.suffix}")
+
+    iterator = iter(rows)
+    batch = list(islice(iterator, batch_size))
+    if columns is None:
+        columns = list(dict.fromkeys(name for row in batch for name in row))
+    count = 0
+
+    if path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, list(columns))
+            writer.writeheader()
+            while batch:
+                _check_columns(batch, columns)
+                writer.writerows(batch)
+                count += len(batch)
+                batch = list(islice(iterator, batch_size))
+        return count
+
+    import pyarrow as pa  # type: ignore[import-not-found,import-untyped]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found,import-untyped]
+
+    if not isinstance(columns, Mapping):
+        columns = {name: _column_type(name, batch) for name in columns}
+    types = {bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string()}
+    schema = pa.schema([(name, types[type_]) for name, type_ in columns.items()])
+    with pq.ParquetWriter(path, schema) as writer:
+        while batch:
+            _check_columns(batch, columns)
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+            batch = list(islice(iterator, batch_size))
+    return count
@@ -1,6 +1,8 @@
 import numpy as np
 from numpy.typing import ArrayLike
 
+Point = tuple[int, int]
+
 
 def in_bounds(array: ArrayLike, *indices: int) -> bool:
     """Check if the given indices are within the bounds of the array."""
@@ -8,3 +10,82 @@ def in_bounds(array: ArrayLike, *indices: int) -> bool:
         0 <= index < shape
         for index, shape in zip(indices, np.asarray(array).shape, strict=True)
     )
+
+
+def signed_area(loop: list[Point]) -> float:
+    """Return the area of a polygon, positive if it is counter-clockwise."""
+    return (
+        sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(loop, loop[1:] + loop[:1]))
+        / 2
+    )
+
+
+def _split(loop: list[Point]) -> list[list[Point]]:
+    """Split a loop that visits a point more than once into simple loops."""
+    loops: list[list[Point]] = []
+    stack: list[Point] = []
+    seen: dict[Point, int] = {}
+    for point in loop:
+        if point in seen:
+            k = seen[point]
+            loops.append(stack[k:])
+            for other in stack[k + 1 :]:
+                del seen[other]
+            del stack[k + 1 :]
+        else:
+            seen[point] = len(stack)
+            stack.append(point)
+    loops.append(stack)
+    return loops
+
+
+def _simplify(loop: list[Point]) -> list[Point]:
+    """Remove the points of a loop that lie on a straight line."""
+    return [
+        (x1, y1)
+        for (x0, y0), (x1, y1), (x2, y2) in zip(
+            loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]
+        )
+        if (x1 - x0, y1 - y0) != (x2 - x1, y2 - y1)
+    ]
+
+
+def outline(array: ArrayLike) -> list[list[Point]]:
+    """
+    Trace the boundaries of the True-like cells of a 2D array.
+
+    Cell (i, j) covers the unit square from (i, j) to (i + 1, j + 1). The
+    boundaries are returned as closed loops of corner points, counter-clockwise
+    around filled regions and clockwise around holes, with collinear points
+    removed. Regions that only touch at a corner are kept apart.
+    """
+    padded = np.pad(np.asarray(array, dtype=bool), 1)
+
+    # Directed unit edges between filled and empty cells, filled on the left
+    edges: set[tuple[Point, Point]] = set()
+    for i, j in np.argwhere(padded).tolist():
+        corners = ((i - 1, j - 1), (i, j - 1), (i, j), (i - 1, j))
+        for n, (di, dj) in enumerate(((0, -1), (1, 0), (0, 1), (-1, 0))):
+            if not padded[i + di, j + dj]:
+                edges.add((corners[n], corners[(n + 1) % 4]))
+
+    loops: list[list[Point]] = []
+    remaining = set(edges)
+    while remaining:
+        first = edge = min(remaining)
+        loop: list[Point] = []
+        while True:
+            remaining.discard(edge)
+            (x0, y0), (x1, y1) = edge
+            loop.append((x0, y0))
+            dx, dy = x1 - x0, y1 - y0
+            # Prefer turning left so that regions touching at a corner split
+            for tx, ty in ((-dy, dx), (dx, dy), (dy, -dx)):
+                edge = ((x1, y1), (x1 + tx, y1 + ty))
+                if edge in edges:
+                    break
+            if edge == first:
+                break
+        loops.extend(_simplify(part) for part in _split(loop))
+
+    return loops
@@ -1,39 +1,80 @@
 from build123d import *
 
+from bd_vslot.cache import cached, geometry_cache
+from bd_vslot.constants import Detail
+from bd_vslot.mesh import MeshMixin
+from bd_vslot.profiling import profiled, stage
 from bd_vslot.utils.typing import Align3D
 
 
-class Wheel(BasePartObject):
+@cached(geometry_cache)
+def _wheel(
+    outer_diameter: float,
+    inner_diameter: float,
+    outer_thickness: float,
+    inner_thickness: float,
+    detail: Detail,
+) -> Part:
+    """Build the geometry of a wheel with the given dimensions."""
+    outer_radius = outer_diameter / 2
+    inner_radius = inner_diameter / 2
+
+    if detail is not Detail.FULL:
+        with BuildPart() as wheel:
+            Cylinder(outer_radius, outer_thickness)
+            if detail is Detail.SIMPLIFIED:
+                Hole(inner_radius)
+        return wheel.part
+
+    with BuildPart() as wheel:
+        with stage("body"):
+            Cylinder(outer_radius, outer_thickness)
+            chamfer(wheel.edges(), (outer_thickness - inner_thickness) / 2)
+        with stage("hole"):
+            Hole(inner_radius)
+            chamfer(wheel.edges(select=Select.LAST), 0.3)
+
+    return wheel.part
+
+
+class Wheel(BasePartObject, MeshMixin):
     """
     Base class for creating wheels with specified dimensions.
 
+    The geometry is cached by dimensions, so creating many wheels of the same
+    size only builds the solid once (see :mod:`bd_vslot.cache`).
+
     :param outer_diameter: The outer diameter of the wheel.
     :param inner_diameter: The diameter of the center hole.
     :param outer_thickness: Thickness (axially) at the outer edge.
     :param inner_thickness: Thickness (axially) at the inner edge.
+    :param detail: Level of detail of the geometry. SIMPLIFIED is a solid
+        ring without the V-groove and ENVELOPE is a plain cylinder.
+        Default: FULL.
     """
 
+    @profiled
     def __init__(
         self,
         outer_diameter: float,
         inner_diameter: float,
         outer_thickness: float,
         inner_thickness: float,
+        detail: Detail | str = Detail.FULL,
         *,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
     ):
-        outer_radius = outer_diameter / 2
-        inner_radius = inner_diameter / 2
-
-        with BuildPart() as wheel:
-            Cylinder(outer_radius, outer_thickness)
-            chamfer(wheel.edges(), (outer_thickness - inner_thickness) / 2)
-            Hole(inner_radius)
-            chamfer(wheel.edges(select=Select.LAST), 0.3)
-
-        super().__init__(wheel.part, rotation, align, mode)
+        part = _wheel(
+            outer_diameter,
+            inner_diameter,
+            outer_thickness,
+            inner_thickness,
+            Detail(detail),
+        )
+        with stage("place"):
+            super().__init__(part, rotation, align, mode)
 
 
 class VSlot2020Wheel(Wheel):
@@ -46,6 +87,7 @@ class VSlot2020Wheel(Wheel):
     def __init__(
         self,
         *,
+        detail: Detail | str = Detail.FULL,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
@@ -55,6 +97,7 @@ class VSlot2020Wheel(Wheel):
             inner_diameter=16,
             outer_thickness=10.2,
             inner_thickness=5.9,
+            detail=detail,
             rotation=rotation,
             align=align,
             mode=mode,
@@ -71,6 +114,7 @@ class VSlot2020MiniWheel(Wheel):
     def __init__(
         self,
         *,
+        detail: Detail | str = Detail.FULL,
         rotation: RotationLike = (0, 0, 0),
         align: Align3D = None,
         mode: Mode = Mode.ADD,
@@ -80,6 +124,7 @@ class VSlot2020MiniWheel(Wheel):
             inner_diameter=10,
             outer_thickness=8.8,
             inner_thickness=5.8,
+            detail=detail,
             rotation=rotation,
             align=align,
             mode=mode,
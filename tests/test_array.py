@@ -0,0 +1,17 @@
+from bd_vslot.utils.array import outline, signed_area
+
+
+def test_outline():
+    assert outline([[1, 1]]) == [[(0, 0), (1, 0), (1, 2), (0, 2)]]
+
+    loops = outline([[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+    assert sorted(map(signed_area, loops)) == [-1, 9]
+
+
+def test_outline_corners():
+    loops = outline([[1, 0], [0, 1]])
+    assert len(loops) == 2
+    assert all(signed_area(loop) == 1 for loop in loops)
+
+    loops = outline([[1, 1, 1, 1], [1, 0, 1, 1], [1, 1, 0, 1], [1, 1, 1, 1]])
+    assert sorted(map(signed_area, loops)) == [-1, -1, 16]
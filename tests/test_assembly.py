@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import pytest
+from build123d import *
+
+from bd_vslot import VSlot2020Rail, VSlot2020Wheel
+from bd_vslot.assembly import Assembly
+
+
+def test_shared_shapes():
+    assembly = Assembly()
+    for x in range(10):
+        assembly.add(VSlot2020Wheel, location=Location((30 * x, 0, 0)))
+        assembly.add(VSlot2020Rail, 100, location=Location((30 * x, 50, 0)))
+    assembly.add(VSlot2020Rail, 200)
+
+    assert len(assembly) == 21
+    assert len(assembly.shapes) == 3
+    assert list(assembly.instances)[-1] == "VSlot2020Rail-11"
+
+    compound = assembly.compound()
+    wheels = [child for child in compound.children if "Wheel" in child.label]
+    assert len(wheels) == 10
+    assert all(wheel.wrapped.IsPartner(wheels[0].wrapped) for wheel in wheels)
+    assert wheels[3].bounding_box().center().X == 90
+
+
+def test_attach():
+    assembly = Assembly()
+    rail = assembly.add(VSlot2020Rail, 100, location=Location((10, 20, 30)))
+    other = assembly.attach("B", rail, "A", VSlot2020Rail, 50)
+
+    assert other.joint_location("B").position == rail.joint_location("A").position
+    assert other.joint_location("B").orientation == rail.joint_location("A").orientation
+
+
+def test_export_step(tmp_path: Path):
+    one = Assembly()
+    one.add(VSlot2020Wheel)
+    one.export_step(tmp_path / "one.step")
+
+    many = Assembly()
+    for x in range(20):
+        many.add(VSlot2020Wheel, location=Location((30 * x, 0, 0)))
+    many.export_step(tmp_path / "many.step")
+
+    text = (tmp_path / "many.step").read_text()
+    assert text.count("MANIFOLD_SOLID_BREP") == 1
+    assert text.count("NEXT_ASSEMBLY_USAGE_OCCURRENCE") >= 20
+    assert (tmp_path / "many.step").stat().st_size < 4 * (
+        tmp_path / "one.step"
+    ).stat().st_size
+
+
+def _frame(assembly: Assembly, length: float):
+    left = assembly.add(VSlot2020Rail, length, label="left")
+    top = assembly.attach("B", left, "A", VSlot2020Rail, 100, label="top")
+    assembly.attach("B", top, "A", VSlot2020Rail, 50, 2, label="bracket")
+    assembly.add(VSlot2020Rail, 100, location=Location((50, 0, 0)), label="right")
+
+
+def test_rerun():
+    assembly = Assembly()
+    _frame(assembly, 100)
+    assert assembly.pop_changes() == {"left", "top", "bracket", "right"}
+
+    _frame(assembly, 100)
+    assert assembly.pop_changes() == set()
+
+    _frame(assembly, 200)
+    assert assembly.pop_changes() == {"left", "top", "bracket"}
+    assert len(assembly) == 4
+
+    _frame(assembly, 300)
+    assert len(assembly.shapes) == 4
+    assembly.prune()
+    assert len(assembly.shapes) == 3
+
+
+def test_update():
+    assembly = Assembly()
+    _frame(assembly, 100)
+    assembly.pop_changes()
+    top = assembly["top"].joint_location("A").position
+
+    assembly.update("left", 150)
+    assert assembly.pop_changes() == {"left", "top", "bracket"}
+    assert assembly["top"].joint_location("A").position == top + (0, 0, 50)
+
+    assembly.update("right", location=Location((60, 0, 0)))
+    assert assembly.pop_changes() == {"right"}
+
+
+def test_attach_cycle():
+    assembly = Assembly()
+    _frame(assembly, 100)
+    with pytest.raises(ValueError, match="cycle"):
+        assembly.attach("B", assembly["bracket"], "A", VSlot2020Rail, 100, label="left")
+    with pytest.raises(ValueError, match="cycle"):
+        assembly.attach("B", assembly["top"], "A", VSlot2020Rail, 100, label="top")
+
+    # The assembly is unchanged
+    assert assembly["left"].location == Location()
+    assembly.attach("B", assembly["bracket"], "A", VSlot2020Rail, 100, label="right")
+    assert len(assembly) == 4
@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from bd_vslot.batch import build_parts, read_config
+
+
+def test_build_parts_failures(tmp_path: Path):
+    parts = {
+        "Bearing625": {},
+        "VSlot2020Rail": {"width": 100},
+        "Unknown": {},
+    }
+    results = build_parts(parts, tmp_path, formats=("brep", "step"), workers=1)
+
+    assert [result.name for result in results] == list(parts)
+    assert results[0].error is None
+    assert results[0].paths == (
+        tmp_path / "Bearing625.brep",
+        tmp_path / "Bearing625.step",
+    )
+    assert all(path.stat().st_size > 0 for path in results[0].paths)
+    assert str(results[1].error).startswith("TypeError")
+    assert results[2].error == "ValueError: Unknown part: Unknown"
+
+
+def test_build_parts_config(tmp_path: Path):
+    config = read_config(Path("src") / "bd_vslot" / "config" / "parts.yaml")
+    results = build_parts(config, tmp_path, formats=("stl",), workers=2)
+
+    assert [result.name for result in results] == list(config)
+    for result in results:
+        assert result.error is None, result.name
+        assert result.paths == (tmp_path / f"{result.name}.stl",)
+        assert result.paths[0].stat().st_size > 0
@@ -0,0 +1,84 @@
+from build123d import Align, Box
+
+from bd_vslot import *
+from bd_vslot.cache import DiskCache, LRUCache, geometry_cache, profile_cache
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 0)
+    cache.get("c", lambda: 3)
+
+    assert cache.get("a", lambda: 0) == 1
+    assert cache.get("b", lambda: 0) == 0
+    assert cache.info() == (2, 4, 2, 2)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 2, 0)
+
+
+def test_lru_cache_resize():
+    cache = LRUCache(maxsize=4)
+    for key in "abcd":
+        cache.get(key, lambda: key)
+    cache.get("a", lambda: "")
+
+    cache.maxsize = 2
+    assert cache.info() == (1, 4, 2, 2)
+    assert cache.get("a", lambda: "") == "a"
+    assert cache.get("b", lambda: "") == ""
+
+    cache.maxsize = 3
+    assert cache.info().currsize == 2
+
+
+def test_geometry_cache():
+    geometry_cache.clear()
+    first = Bearing625()
+    second = Bearing625(align=(Align.MIN, Align.MIN, Align.MIN))
+    third = Bearing625()
+
+    assert geometry_cache.info().misses == 1
+    assert geometry_cache.info().hits == 2
+    assert first is not third
+    assert first.volume == third.volume
+    assert first.bounding_box().min != second.bounding_box().min
+    assert first.bounding_box().min == third.bounding_box().min
+
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache(tmp_path)
+    first = cache.get("plate", lambda: Box(10, 10, 2))
+    second = cache.get("plate", lambda: Box(1, 1, 1))
+
+    assert cache.info().misses == 1
+    assert cache.info().hits == 1
+    assert first.volume == second.volume
+    assert len(list(tmp_path.glob("*.brep"))) == 1
+
+    cache.max_bytes = 0
+    cache.get("rail", lambda: Box(1, 1, 1))
+    assert cache.info().currsize == 0
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 0)
+
+
+def test_disk_cache_disabled():
+    cache = DiskCache()
+    cache.get("plate", lambda: Box(1, 1, 1))
+    assert cache.info() == (0, 0, 2**30, 0)
+
+
+def test_profile_cache():
+    profile_cache.clear()
+    VSlot2020RailProfile.preload([[[1], [1]]])
+    first = VSlot2020Rail(100, 2, 1)
+    second = VSlot2020Rail(200, 2, 1)
+    VSlot2020Rail(100, 1, 1)
+
+    assert profile_cache.info().misses == 2
+    assert profile_cache.info().hits == 2
+    assert abs(second.volume - 2 * first.volume) < 1e-6 * second.volume
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from build123d import *
+
+from bd_vslot import Detail, VSlot2020Rail, VSlot2020Wheel
+from bd_vslot.assembly import Assembly
+from bd_vslot.clearance import Clash, box_pairs, find_clashes
+
+
+def test_box_pairs():
+    rng = np.random.default_rng(0)
+    lower = rng.uniform(0, 100, (200, 3))
+    upper = lower + rng.uniform(0, 15, (200, 3))
+    lower[0], upper[0] = lower[1] - 5, lower[1]  # Touching boxes overlap
+
+    expected = [
+        (i, j)
+        for i in range(200)
+        for j in range(i + 1, 200)
+        if np.all((lower[j] <= upper[i]) & (lower[i] <= upper[j]))
+    ]
+    assert box_pairs(lower, upper).tolist() == [list(pair) for pair in expected]
+    assert (0, 1) in expected
+    assert box_pairs(np.empty((0, 3)), np.empty((0, 3))).shape == (0, 2)
+
+
+def _frame() -> Assembly:
+    frame = Assembly()
+    frame.add(VSlot2020Rail, 100, label="base")
+    frame.add(VSlot2020Rail, 100, location=Location((20, 0, 0)), label="touch")
+    frame.add(VSlot2020Rail, 100, location=Location((0, 15, 0)), label="overlap")
+    frame.add(
+        VSlot2020Rail, 100, location=Location((0, 0, 110), (0, 90, 0)), label="butt"
+    )
+    frame.add(VSlot2020Rail, 100, location=Location((-20.3, 0, 0)), label="near")
+    frame.add(VSlot2020Wheel, location=Location((0, 30, 50)), label="wheel")
+    return frame
+
+
+def test_find_clashes():
+    frame = _frame()
+    assert find_clashes(frame) == [
+        Clash("base", "overlap", 0, True),
+        Clash("overlap", "wheel", 0, True),
+    ]
+
+    clashes = {(c.first, c.second): c for c in find_clashes(frame, clearance=0.5)}
+    assert clashes["base", "touch"] == Clash("base", "touch", 0, False)
+    assert clashes["base", "butt"].distance == 0
+    assert clashes["base", "near"].distance == pytest.approx(0.3)
+    assert clashes["overlap", "wheel"].interference
+    assert ("touch", "near") not in clashes
+
+
+def test_narrow_phase():
+    # The same rails without the attributes that the narrow phase uses are
+    # all checked exactly
+    rails = [
+        VSlot2020Rail(60),
+        VSlot2020Rail(60, 2, 1).moved(Location((0, 5, 0))),
+        VSlot2020Rail(40, 3, 2, True).moved(Location((-20, -20, 0))),
+        VSlot2020Rail(40, detail=Detail.SIMPLIFIED).moved(Location((-30, 0, 30))),
+        VSlot2020Rail(30, detail=Detail.ENVELOPE).moved(Location((-25, -40, 0))),
+        VSlot2020Rail(40).moved(Location((-10, 0, 70.5), (0, 90, 0))),
+    ]
+    plain = [Part(rail.wrapped) for rail in rails]
+    clashes = find_clashes(rails)
+    assert [(c.first, c.second) for c in clashes] == [
+        ("0", "1"),
+        ("1", "2"),
+        ("2", "3"),
+    ]
+    assert clashes == find_clashes(plain)
+    assert find_clashes(rails, clearance=1) == find_clashes(plain, clearance=1)
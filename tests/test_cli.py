@@ -0,0 +1,76 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bd_vslot.batch import EXPORTERS
+from bd_vslot.cli import FORMATS, main, read_ndjson
+
+
+def test_cli_ndjson(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+):
+    stdin = io.StringIO(
+        '{"Bearing625": {}}\n'
+        "\n"
+        '{"VSlot2020SlidingTNut": {"hole_radius": 2.0}}\n'
+        '{"VSlot2020SlidingTNut": {"hole_radius": 2.5}}\n'
+    )
+    monkeypatch.setattr("sys.stdin", stdin)
+
+    assert main(["-o", str(tmp_path), "-f", "stl", "3mf", "-j", "1"]) == 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "Bearing625.3mf",
+        "Bearing625.stl",
+        "VSlot2020SlidingTNut-1.3mf",
+        "VSlot2020SlidingTNut-1.stl",
+        "VSlot2020SlidingTNut.3mf",
+        "VSlot2020SlidingTNut.stl",
+    ]
+
+
+def test_cli_bad_lines(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+):
+    stdin = io.StringIO(
+        '{"Bearing625": {}}\n'
+        '{"Bearing688": \n'
+        "[1, 2]\n"
+        '{"VSlot2020SlidingTNut": {"hole_radius": 2.0}}\n'
+    )
+    monkeypatch.setattr("sys.stdin", stdin)
+
+    assert main(["-o", str(tmp_path), "-j", "1"]) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "Bearing625.stl",
+        "VSlot2020SlidingTNut.stl",
+    ]
+    errors = capsys.readouterr().err.splitlines()
+    assert errors[0].startswith("line 2\t") and "JSONDecodeError" in errors[0]
+    assert errors[1].startswith("line 3\t") and "Expected an object" in errors[1]
+
+    with pytest.raises(ValueError):
+        list(read_ndjson(["[]"]))
+
+
+def test_cli_failure(tmp_path: Path):
+    config = tmp_path / "parts.json"
+    config.write_text('{"Bearing625": {}, "Unknown": {}}')
+
+    assert main([str(config), "-o", str(tmp_path / "out"), "-j", "1"]) == 1
+    assert (tmp_path / "out" / "Bearing625.stl").is_file()
+
+
+def test_cli_help():
+    assert FORMATS == tuple(sorted(EXPORTERS))
+    code = (
+        "import sys; from bd_vslot.cli import main\n"
+        "try:\n    main(['--help'])\nexcept SystemExit:\n    pass\n"
+        "assert 'build123d' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
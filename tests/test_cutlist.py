@@ -0,0 +1,114 @@
+import random
+from collections import Counter
+from math import ceil
+from pathlib import Path
+
+import pytest
+
+from bd_vslot.cutlist import Rail, cut_list, export_rails, unique_rails
+from bd_vslot.rails import RailProfileSpec
+
+
+def test_cut_list():
+    rails = [Rail(500, 3), Rail(400, 2), Rail(300, 2, 2, 1)]
+    bars = cut_list(rails, 1000, kerf=5)
+
+    assert [bar.profile for bar in bars] == [RailProfileSpec.box()] * 3 + [
+        RailProfileSpec.box(2, 1).canonical()
+    ]
+    assert sorted(cut for bar in bars for cut in bar.cuts) == sorted(
+        [500] * 3 + [400] * 2 + [300] * 2
+    )
+    for bar in bars:
+        used = sum(bar.cuts) + 5 * (len(bar.cuts) - 1)
+        assert used <= 1000
+        assert bar.offcut == pytest.approx(max(1000 - used - 5, 0))
+
+
+def test_kerf():
+    assert len(cut_list([Rail(500, 2)], 1000)) == 1
+    assert len(cut_list([Rail(500, 2)], 1000, kerf=1)) == 2
+    assert len(cut_list([Rail(499, 2)], 1000, kerf=2)) == 1
+
+    with pytest.raises(ValueError):
+        cut_list([Rail(1001)], 1000)
+
+
+def test_exact():
+    # The heuristic needs 3 bars, but 50 + 30 + 20 and 40 + 40 + 20 is 2
+    rails = [Rail(50), Rail(40, 2), Rail(30), Rail(20, 2)]
+    assert len(cut_list(rails, 100)) == 3
+    assert len(cut_list(rails, 100, exact=True)) == 2
+
+
+def test_many_rails():
+    random.seed(0)
+    rails = [
+        Rail(random.randrange(100, 1500, 10), random.randint(1, 4), *profile)
+        for profile in [(1, 1), (2, 1), (4, 2)]
+        for _ in range(1000)
+    ]
+
+    bars = cut_list(rails, 1500, kerf=3)
+    assert sum(len(bar.cuts) for bar in bars) == sum(rail.quantity for rail in rails)
+
+    # Within a few percent of the bars needed for the total length
+    counts = Counter(bar.profile for bar in bars)
+    for profile, count in counts.items():
+        needed = sum(
+            (rail.length + 3) * rail.quantity
+            for rail in rails
+            if rail.profile.canonical() == profile
+        )
+        assert ceil(needed / 1503) <= count <= 1.05 * ceil(needed / 1503)
+    for bar in bars:
+        assert bar.offcut == pytest.approx(
+            max(1500 - sum(bar.cuts) - 3 * len(bar.cuts), 0)
+        )
+
+
+def test_profile_spec():
+    l_beam = RailProfileSpec.from_array([[1, 1], [1, 0]])
+    rails = [
+        Rail(600, profile_spec=l_beam),
+        Rail(600, profile_spec=RailProfileSpec.from_array([[1, 0], [1, 1]])),
+        Rail(300, 2, 2, 1),
+        Rail(300, profile_spec=RailProfileSpec.box(1, 2)),
+    ]
+    bars = cut_list(rails, 1500)
+    assert [(bar.profile, bar.cuts) for bar in bars] == [
+        (l_beam.canonical(), (600, 600)),
+        (RailProfileSpec.box(2, 1).canonical(), (300, 300, 300)),
+    ]
+
+    # Rails are only the same if their profiles are the same way around
+    more = [*rails, Rail(300, profile_spec=RailProfileSpec.box(2, 1))]
+    assert unique_rails(more) == [rails[0], rails[1], Rail(300, 3, 2, 1), rails[3]]
+
+
+def test_export_rails(tmp_path: Path):
+    rails = [Rail(50, 2), Rail(30), Rail(50, 1)]
+    assert unique_rails(rails) == [Rail(50, 3), Rail(30)]
+
+    results = export_rails(rails, tmp_path, workers=1)
+    assert list(results) == [Rail(50, 3), Rail(30)]
+    assert all(result.error is None for result in results.values())
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "VSlot2020Rail-1x1-30.stl",
+        "VSlot2020Rail-1x1-50.stl",
+    ]
+
+
+def test_export_rails_names(tmp_path: Path):
+    rails = [
+        Rail(12.5, 1, 2, 1),
+        Rail(20, 1, 4, 2, True),
+        Rail(10, profile_spec=RailProfileSpec.from_array([[1, 1], [1, 0]])),
+    ]
+    results = export_rails(rails, tmp_path, formats=("brep",), workers=1)
+    assert [result.name for result in results.values()] == [
+        "VSlot2020Rail-2x1-12.5",
+        "VSlot2020Rail-c-beam-4x2-20",
+        "VSlot2020Rail-2x2-7-10",
+    ]
+    assert all(path.is_file() for result in results.values() for path in result.paths)
@@ -0,0 +1,50 @@
+from typing import Any
+
+import pytest
+from build123d import *
+
+from bd_vslot import (
+    Bearing625,
+    Detail,
+    VSlot2020MiniWheel,
+    VSlot2020Rail,
+    VSlot2020RailProfile,
+    VSlot2020Wheel,
+)
+
+CASES = [
+    (VSlot2020Rail, (50, 2, 2)),
+    (VSlot2020Rail, (50, 4, 2, True)),
+    (Bearing625, ()),
+    (VSlot2020Wheel, ()),
+    (VSlot2020MiniWheel, ()),
+]
+
+
+@pytest.mark.parametrize("cls, args", CASES)
+def test_detail(cls: Any, args: tuple):
+    full = cls(*args)
+    simplified = cls(*args, detail=Detail.SIMPLIFIED)
+    envelope = cls(*args, detail="envelope")
+
+    box = full.bounding_box()
+    for part in (simplified, envelope):
+        assert part.bounding_box().min == box.min
+        assert part.bounding_box().max == box.max
+        assert part.joints.keys() == full.joints.keys()
+        assert len(part.faces()) < len(full.faces())
+
+    assert full.volume < simplified.volume <= envelope.volume
+
+
+def test_rail_profile_detail():
+    array = [[1, 1], [1, 0], [1, 1]]
+    assert VSlot2020RailProfile(array, Detail.SIMPLIFIED).area == pytest.approx(5 * 400)
+    assert VSlot2020RailProfile(array, Detail.ENVELOPE).area == pytest.approx(6 * 400)
+
+
+@pytest.mark.parametrize("detail", list(Detail))
+def test_rail_estimate_detail(detail: Detail):
+    rail = VSlot2020Rail(50, 4, 2, True, detail)
+    metadata = VSlot2020Rail.estimate(50, 4, 2, True, detail)
+    assert metadata.volume == pytest.approx(rail.volume)
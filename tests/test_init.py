@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import bd_vslot
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, bd_vslot; bd_vslot.BoltSize; "
+        "assert 'build123d' not in sys.modules and 'numpy' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_all():
+    for name in bd_vslot.__all__:
+        assert getattr(bd_vslot, name) is not None
+    assert set(dir(bd_vslot)) >= {"BoltSize", "VSlot2020Rail", "LazyRail"}
+
+
+def test_build123d_names():
+    # 'from bd_vslot import *' still gives build123d's names too
+    code = (
+        "from bd_vslot import *; import build123d; "
+        "assert Box is build123d.Box and export_stl is build123d.export_stl; "
+        "assert VSlot2020Rail.__module__ == 'bd_vslot.rails'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,99 @@
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from build123d import *
+
+from bd_vslot import Bearing625, BoltSize, BuildPlate, VSlot2020Rail, VSlot2020Wheel
+from bd_vslot.cache import mesh_cache
+from bd_vslot.mesh import export_mesh_3mf, export_mesh_stl, tessellate
+
+
+def _volume(mesh) -> float:
+    v0, v1, v2 = (mesh.vertices[mesh.triangles[:, k]] for k in range(3))
+    return np.einsum("ij,ij->i", v0, np.cross(v1, v2)).sum() / 6
+
+
+def test_tessellate():
+    rail = VSlot2020Rail(100)
+    mesh = tessellate(rail)
+
+    box = rail.bounding_box()
+    assert tuple(mesh.vertices.min(axis=0)) == pytest.approx(tuple(box.min))
+    assert tuple(mesh.vertices.max(axis=0)) == pytest.approx(tuple(box.max))
+    assert _volume(mesh) == pytest.approx(rail.volume, rel=1e-3)
+
+
+@pytest.mark.parametrize(
+    "part",
+    [BuildPlate(2, 4, 3, BoltSize.M3), Bearing625(), VSlot2020Rail(50, 2, 2)],
+    ids=lambda part: type(part).__name__,
+)
+def test_closed(part: Part):
+    # Every edge is shared by exactly two triangles, once in each direction
+    triangles = tessellate(part).triangles
+    edges = triangles[:, [[0, 1], [1, 2], [2, 0]]].reshape(-1, 2)
+    assert len(np.unique(edges, axis=0)) == len(edges)
+    _, counts = np.unique(np.sort(edges, axis=1), axis=0, return_counts=True)
+    assert (counts == 2).all()
+
+
+def test_cached_copies():
+    mesh_cache.clear()
+    wheel = VSlot2020Wheel()
+    tessellate(wheel)
+    misses = mesh_cache.info().misses
+
+    moved = wheel.moved(Location((10, 20, 30), (0, 90, 0)))
+    mesh = tessellate(Compound(children=[wheel, moved]))
+    assert mesh_cache.info().misses == misses
+    assert mesh_cache.info().hits == 2
+
+    half = len(mesh.vertices) // 2
+    assert tuple(mesh.vertices[half:].mean(axis=0)) == pytest.approx(
+        tuple(moved.center()), abs=0.5
+    )
+
+
+def test_export_stl(tmp_path: Path):
+    rail = VSlot2020Rail(100)
+    path = tmp_path / "rail.stl"
+    export_mesh_stl(rail, path)
+
+    triangles = len(tessellate(rail).triangles)
+    data = path.read_bytes()
+    assert int.from_bytes(data[80:84], "little") == triangles
+    assert len(data) == 84 + 50 * triangles
+
+    imported = import_stl(path)
+    assert tuple(imported.bounding_box().size) == pytest.approx(
+        tuple(rail.bounding_box().size), abs=1e-3
+    )
+
+
+def test_export_3mf(tmp_path: Path):
+    path = tmp_path / "wheel.3mf"
+    export_mesh_3mf(VSlot2020Wheel(), path)
+
+    with zipfile.ZipFile(path) as archive:
+        assert "[Content_Types].xml" in archive.namelist()
+        model = archive.read("3D/3dmodel.model").decode()
+    mesh = tessellate(VSlot2020Wheel())
+    assert model.count("<vertex ") == len(mesh.vertices)
+    assert model.count("<triangle ") == len(mesh.triangles)
+
+
+def test_mesh_arrays(tmp_path: Path):
+    rail = VSlot2020Rail(100)
+    vertices, triangles = rail.mesh_arrays()
+    assert vertices.dtype == np.float32 and triangles.dtype == np.uint32
+    assert vertices.flags.c_contiguous and triangles.flags.c_contiguous
+    assert not vertices.flags.writeable
+    assert rail.mesh_arrays().vertices is vertices
+    assert triangles.data.format == "I"
+
+    mapped = rail.mesh_arrays(path=tmp_path / "rail")
+    assert isinstance(mapped.vertices, np.memmap)
+    assert np.array_equal(mapped.vertices, vertices)
+    assert np.array_equal(mapped.triangles, triangles)
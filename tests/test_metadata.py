@@ -0,0 +1,70 @@
+from math import pi
+from typing import Any
+
+import pytest
+from build123d import *
+
+from bd_vslot import (
+    ALUMINIUM_DENSITY,
+    BoltSize,
+    BuildPlate,
+    LPlate,
+    VSlot2020EndCap,
+    VSlot2020Rail,
+)
+
+CASES = [
+    (VSlot2020Rail, (100,)),
+    (VSlot2020Rail, (50, 2, 3)),
+    (VSlot2020Rail, (50, 4, 2, True)),
+    (VSlot2020Rail, (10, 3, 3)),
+    (VSlot2020Rail, (10, 4, 4)),
+    (VSlot2020EndCap, (2, 3, 2, BoltSize.M5, 1, 0.5)),
+    (VSlot2020EndCap, (3, 1, 1, 2.6)),
+    (BuildPlate, (2, 4, 3, BoltSize.M3)),
+    (BuildPlate, (2, 4, 3, BoltSize.M3, 0, 0.5)),
+    (BuildPlate, (3, 6, 5, 1.6, 5, 1)),
+    (LPlate, (2, 4, 3, 2, BoltSize.M3)),
+    (LPlate, (2, 4, 3, 2, BoltSize.M3, 1)),
+]
+
+
+@pytest.mark.parametrize("cls, args", CASES)
+def test_estimate(cls: Any, args: tuple):
+    part = cls(*args)
+    metadata = cls.estimate(*args)
+
+    assert metadata.volume == pytest.approx(part.volume)
+    assert metadata.mass == pytest.approx(part.volume * ALUMINIUM_DENSITY)
+
+    box = part.bounding_box()
+    assert metadata.bounding_box[0] == pytest.approx(tuple(box.min))
+    assert metadata.bounding_box[1] == pytest.approx(tuple(box.max))
+
+    for position, direction, radius in metadata.holes:
+        axis = Vector(position) + Vector(direction) * 0.5
+        assert not part.is_inside(axis)
+        assert part.is_inside(
+            axis
+            + Vector(direction).cross(Vector(1, 1, 1)).normalized() * (radius + 0.2)
+        )
+
+
+def test_estimate_density():
+    metadata = BuildPlate.estimate(2, 4, 3, BoltSize.M3, density=1.24e-3)
+    assert metadata.mass == pytest.approx(metadata.volume * 1.24e-3)
+
+
+@pytest.mark.parametrize("args", [(2, 3, 3, 5.5), (2, 1, 2, 10.5)])
+def test_estimate_overlapping_holes(args: tuple):
+    # Subtracting each hole separately, as the estimate does for holes that
+    # are apart, gives the wrong volume, so the estimate refuses
+    thickness, num_x_holes, num_y_holes, radius = args
+    width, height = 10 * (num_x_holes + 1), 10 * (num_y_holes + 1)
+    disjoint = (width * height - num_x_holes * num_y_holes * pi * radius**2) * thickness
+    assert BuildPlate(*args).volume != pytest.approx(disjoint)
+
+    with pytest.raises(ValueError, match="overlap"):
+        BuildPlate.estimate(*args)
+    with pytest.raises(ValueError, match="overlap"):
+        LPlate.estimate(2, num_x_holes, num_y_holes, num_y_holes, radius)
@@ -0,0 +1,67 @@
+import pytest
+from build123d import *
+
+from bd_vslot.plates import _chamfer_ring, _hole_grid
+
+
+def _hole_grid_boolean(
+    width: float,
+    height: float,
+    corner_radius: float,
+    pitch: float,
+    num_x_holes: int,
+    num_y_holes: int,
+    hole_radius: float,
+) -> Sketch:
+    """Reference hole grid, cut one circle at a time."""
+    with BuildSketch() as sketch:
+        (
+            RectangleRounded(width, height, corner_radius)
+            if corner_radius
+            else Rectangle(width, height)
+        )
+        with GridLocations(pitch, pitch, num_x_holes, num_y_holes):
+            Circle(hole_radius, mode=Mode.SUBTRACT)
+    return sketch.sketch
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (50, 40, 0, 10, 4, 3, 1.6),
+        (50, 40, 1, 10, 4, 3, 1.6),
+        (60, 40, 9, 20, 3, 2, 2.6),
+        (20, 20, 0, 20, 1, 1, 9.9),
+    ],
+)
+def test_hole_grid(args: tuple):
+    face = _hole_grid(*args)
+    expected = _hole_grid_boolean(*args)
+
+    assert face is not None
+    assert face.is_valid
+    assert len(face.inner_wires()) == args[4] * args[5]
+    assert face.area == pytest.approx(expected.area)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (50, 40, 0, 10, 4, 3, 5),
+        (50, 40, 0, 10, 4, 3, 10),
+        (60, 40, 11, 20, 3, 2, 2.6),
+    ],
+)
+def test_hole_grid_overlapping(args: tuple):
+    assert _hole_grid(*args) is None
+
+
+def test_chamfer_ring():
+    with BuildPart() as plate:
+        Box(50, 40, 2, align=(Align.CENTER, Align.CENTER, Align.MIN))
+        chamfer(plate.edges().group_by(Axis.Z)[-1], 0.5)
+
+    ring = _chamfer_ring(50, 40, 0, 2, 0.5)
+    box = Box(50, 40, 2, align=(Align.CENTER, Align.CENTER, Align.MIN))
+
+    assert (box - ring).volume == pytest.approx(plate.part.volume)
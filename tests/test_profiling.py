@@ -0,0 +1,55 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+from build123d import Align, BuildPart, Shape
+
+from bd_vslot import *
+from bd_vslot.cache import profile_cache
+from bd_vslot.profiling import MemoryUsage, memory_usage, profile
+
+
+def test_profile(tmp_path: Path):
+    profile_cache.clear()
+    with profile() as profiler:
+        VSlot2020Rail(100, align=(Align.MIN, Align.MIN, Align.MIN))
+    VSlot2020Rail(100)
+
+    totals = profiler.totals()
+    assert totals["part", "VSlot2020Rail"][0] == 1
+    assert totals["part", "VSlot2020RailProfile"][0] == 1
+    assert totals["stage", "extrude"][0] == 1
+    assert totals["boolean", "Cut"][0] >= 1
+
+    profiler.dump(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == len(profiler.events)
+    assert all(event["ph"] == "X" for event in events)
+
+
+def test_profile_memory():
+    with profile(memory=True) as profiler:
+        parts = [VSlot2020RailProfile([[1, 1], [1, 0], [1, i]]) for i in (0, 1)]
+
+    events = [event for event in profiler.events if event.category == "part"]
+    assert len(events) == 2
+    assert all(event.args["shapes"] > 0 for event in events)
+    assert set(events[0].args) == set(MemoryUsage._fields)
+
+    totals = profiler.memory_totals()
+    assert totals["VSlot2020RailProfile"].shapes == sum(
+        event.args["shapes"] for event in events
+    )
+    assert len(profiler.snapshots) == 2
+    assert profiler.top_allocations()
+    assert not tracemalloc.is_tracing()
+
+    # Shapes are only counted while memory profiling is active, and counting
+    # them leaves build123d's classes unchanged
+    assert memory_usage().shapes == 0
+    assert "__new__" not in vars(Shape) and "__new__" not in vars(BuildPart)
+    with profile() as profiler:
+        VSlot2020RailProfile([[1, 1]])
+    assert "shapes" not in profiler.events[-1].args
+    assert parts
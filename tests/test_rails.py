@@ -0,0 +1,181 @@
+from collections import defaultdict
+from itertools import product
+
+import numpy as np
+import pytest
+from build123d import *
+
+from bd_vslot import Detail, RailProfileSpec, VSlot2020Rail
+from bd_vslot.cache import profile_cache, rail_cache
+from bd_vslot.rails import (
+    LazyRail,
+    VSlot2020RailProfile,
+    _c_beam,
+    _canonical_rail_profile,
+    _classify,
+)
+from bd_vslot.utils.array import in_bounds
+
+
+def _classify_loop(array: np.ndarray) -> dict[str, set[tuple[int, int, int]]]:
+    """Reference classification, one cell and direction at a time."""
+
+    def _get(i: int, j: int) -> bool:
+        return in_bounds(array, i, j) and array[i, j]
+
+    features = defaultdict(set)
+    for i, j in product(*map(range, array.shape)):
+        if not array[i, j]:
+            continue
+        if all(map(_get, (i + 1, i, i - 1, i), (j, j + 1, j, j - 1))):
+            continue
+
+        features["squares"].add((i, j, 0))
+        for n, (di, dj) in enumerate(((1, 0), (0, 1), (-1, 0), (0, -1))):
+            cell = (i, j, n)
+            if _get(i + di, j + dj):
+                if di:
+                    if _get(i, j + di):
+                        if _get(i + di, j + di):
+                            features["center_cavities"].add(cell)
+                        else:
+                            features["corner_cavities"].add(cell)
+                    else:
+                        features["edge_cavities"].add(cell)
+                    if _get(i, j - di):
+                        if _get(i + di, j - di):
+                            features["center_cavities_mirrored"].add(cell)
+                        else:
+                            features["corner_cavities_mirrored"].add(cell)
+                    else:
+                        features["edge_cavities_mirrored"].add(cell)
+                else:
+                    if _get(i + dj, j):
+                        if _get(i + dj, j + dj):
+                            features["center_cavities_mirrored"].add(cell)
+                        else:
+                            features["corner_cavities_mirrored"].add(cell)
+                    else:
+                        features["edge_cavities_mirrored"].add(cell)
+                    if _get(i - dj, j):
+                        if _get(i - dj, j + dj):
+                            features["center_cavities"].add(cell)
+                        else:
+                            features["corner_cavities"].add(cell)
+                    else:
+                        features["edge_cavities"].add(cell)
+            else:
+                features["slots"].add(cell)
+
+    return features
+
+
+def test_classify():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        shape = rng.integers(1, 9, size=2)
+        array = rng.random(shape) < rng.random()
+        expected = _classify_loop(array)
+
+        for name, rows in _classify(array).items():
+            cells = set(map(tuple, rows.tolist()))
+            assert len(cells) == len(rows)
+            assert cells == expected[name], name
+
+
+def test_profile_in_builder():
+    profile_cache.clear()
+    area = VSlot2020RailProfile([[1, 1]]).area
+
+    profile_cache.clear()
+    with BuildPart() as part:
+        with BuildSketch() as sketch:
+            VSlot2020RailProfile([[1, 1]])
+        extrude(amount=10)
+
+    assert sketch.sketch.area == area
+    assert part.part.volume == pytest.approx(10 * area)
+
+
+def test_profile_spec():
+    spec = RailProfileSpec.from_array([[0, 0, 0], [0, 1, 1], [0, 1, 0]])
+    assert spec == RailProfileSpec.from_array([[1, 1], [1, 0]])
+    assert spec.shape == (2, 2)
+    assert spec.to_array().tolist() == [[True, True], [True, False]]
+
+    c_beam = RailProfileSpec.c_beam(4, 2)
+    assert len(c_beam.to_bytes()) == 3
+    assert RailProfileSpec.from_bytes(c_beam.to_bytes()) == c_beam
+    assert len({c_beam, RailProfileSpec.from_array(_c_beam(4, 2))}) == 1
+
+    with pytest.raises(ValueError):
+        RailProfileSpec.from_array([[0]])
+
+
+def test_canonical_profile():
+    array = np.array([[1, 1, 1], [1, 0, 0], [1, 1, 0]], dtype=bool)
+    orientations = [np.rot90(a, k) for a in (array, array[:, ::-1]) for k in range(4)]
+    specs = {RailProfileSpec.from_array(a) for a in orientations}
+    assert len(specs) == 8
+    assert len({spec.canonical() for spec in specs}) == 1
+
+    profile_cache.clear()
+    for spec in specs:
+        profile = VSlot2020RailProfile(spec)
+        expected = _canonical_rail_profile.__wrapped__(spec, Detail.FULL)
+        assert (profile - expected).area < 1e-6
+        assert (expected - profile).area < 1e-6
+    assert profile_cache.info().misses == 1
+
+
+def test_profile_offset():
+    profile = VSlot2020RailProfile([[0, 0], [0, 1]])
+    assert tuple(profile.center()) == pytest.approx((20, 20, 0))
+
+
+def test_rail_profile_spec():
+    spec = RailProfileSpec.c_beam(3, 2)
+    rail = VSlot2020Rail(10, profile=spec)
+    assert rail.volume == pytest.approx(VSlot2020Rail(10, 3, 2, True).volume)
+    assert VSlot2020Rail.estimate(10, profile=spec).volume == pytest.approx(rail.volume)
+
+
+def test_lazy_rail():
+    rail_cache.clear()
+    location = Location((50, 0, 0), (0, 90, 0))
+    lazy = LazyRail(30, 2, 1, location=location)
+    assert rail_cache.info().currsize == 0
+
+    part = lazy.part()
+    assert rail_cache.info().currsize == 1
+    assert isinstance(part, VSlot2020Rail)
+    box, expected = lazy.bounding_box(), part.bounding_box()
+    assert tuple(box.min) == pytest.approx(tuple(expected.min))
+    assert tuple(box.max) == pytest.approx(tuple(expected.max))
+    assert tuple(lazy.joint_location("A").position) == pytest.approx((80, 0, 0))
+    assert lazy.estimate().volume == pytest.approx(part.volume)
+
+    # Rails of the same dimensions share one solid
+    other = LazyRail(30, profile=RailProfileSpec.box(2, 1)).part()
+    assert other.wrapped.IsPartner(part.wrapped)
+    assert rail_cache.info().hits == 1
+
+
+def test_many():
+    matrices = np.tile(np.eye(4), (4, 1, 1))
+    matrices[:, 0, 3] = [0, 30, 60, 90]
+    matrices[3, :3, :3] = [[0, 0, 1], [0, 1, 0], [-1, 0, 0]]
+    assembly = VSlot2020Rail.many([100, 50, 100, 50], matrices, 2, 1)
+
+    assert len(assembly) == 4
+    assert len(assembly.shapes) == 2
+    rails = list(assembly)
+    assert rails[0].shape is rails[2].shape
+    assert rails[1].shape.volume == pytest.approx(VSlot2020Rail(50, 2, 1).volume)
+    assert tuple(rails[2].joint_location("A").position) == pytest.approx((60, 0, 100))
+    assert tuple(rails[3].joint_location("A").position) == pytest.approx((140, 0, 0))
+
+    VSlot2020Rail.many([20], profile=[RailProfileSpec.box()], assembly=assembly)
+    assert len(assembly) == 5
+    with pytest.raises(ValueError):
+        VSlot2020Rail.many([10, 20], [Location()])
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from bd_vslot import VSlot2020Rail, VSlot2020Wheel
+from bd_vslot.service import BuildService
+
+
+def test_merge_requests():
+    async def run():
+        async with BuildService(workers=2) as service:
+            builds = [service.build(VSlot2020Rail, 100, 2) for _ in range(3)]
+            builds.append(service.build(VSlot2020Rail, length=50))
+            tasks = [asyncio.ensure_future(build) for build in builds]
+            await asyncio.sleep(0)
+            assert service.pending == 2
+            return await asyncio.gather(*tasks), service.pending
+
+    (a, b, c, d), pending = asyncio.run(run())
+    assert pending == 0
+    assert a is not b and a.wrapped.IsPartner(b.wrapped)
+    assert a.volume == pytest.approx(VSlot2020Rail(100, 2).volume)
+    assert d.bounding_box().size.Z == pytest.approx(50)
+    assert d.joints["B"].location == VSlot2020Rail(50).joints["B"].location
+
+
+def test_limits():
+    async def run():
+        async with BuildService(workers=1, max_pending=1) as service:
+            with pytest.raises(TimeoutError):
+                await service.build(VSlot2020Wheel, timeout=1e-3)
+            assert service.pending == 0
+
+            task = asyncio.ensure_future(service.build(VSlot2020Wheel))
+            await asyncio.sleep(0)
+            with pytest.raises(asyncio.QueueFull):
+                await service.build(VSlot2020Rail, 100)
+            return await task
+
+    assert asyncio.run(run()).volume > 0
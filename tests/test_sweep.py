@@ -0,0 +1,148 @@
+import csv
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from bd_vslot import BoltSize, BuildPlate, LPlate
+from bd_vslot.cache import profile_cache
+from bd_vslot.sweep import grid, iter_sweep, sweep, write_rows
+
+
+def _holes(metadata: Any) -> dict[str, int]:
+    return {"holes": len(metadata.holes)}
+
+
+def _thin_holes(metadata: Any) -> dict[str, int]:
+    if metadata.bounding_box[1][2] > 2:
+        raise ValueError("Too thick")
+    return _holes(metadata)
+
+
+def _thickening_sweep() -> Any:
+    """A sweep where the first two plates succeed and the last two fail."""
+    return sweep(
+        BuildPlate,
+        thickness=[1, 2, 3, 4],
+        num_x_holes=[2],
+        num_y_holes=[2],
+        hole_radius=[1.6],
+        build=False,
+        measure=_thin_holes,
+    )
+
+
+def test_grid():
+    points = grid(a=[1, 2], b="xy")
+    assert points == [
+        {"a": 1, "b": "x"},
+        {"a": 1, "b": "y"},
+        {"a": 2, "b": "x"},
+        {"a": 2, "b": "y"},
+    ]
+
+
+def test_sweep_shares_profiles():
+    profile_cache.clear()
+    rows = list(
+        sweep(
+            BuildPlate,
+            thickness=[2, 3],
+            num_x_holes=[2, 3],
+            num_y_holes=[2],
+            hole_radius=[BoltSize.M3],
+            chamfer_size=[0, 0.5],
+            workers=1,
+        )
+    )
+
+    assert len(rows) == 8
+    assert all(row["error"] is None for row in rows)
+    assert profile_cache.info().misses == 2
+    assert rows[0]["hole_radius"] == "M3"
+
+    row = next(row for row in rows if row["thickness"] == 3 and row["chamfer_size"])
+    plate = BuildPlate(3, row["num_x_holes"], 2, BoltSize.M3, 0, 0.5)
+    assert row["volume"] == pytest.approx(plate.volume)
+    assert row["size_z"] == pytest.approx(3)
+
+
+def test_sweep_estimate():
+    points = grid(
+        thickness=[2, 3], num_x_holes=range(1, 5), num_y_holes=[2], num_z_holes=[3]
+    )
+    for point in points:
+        point["hole_radius"] = BoltSize.M5
+    rows = list(iter_sweep(LPlate, points, build=False, measure=_holes))
+
+    assert len(rows) == 8
+    assert rows[0]["holes"] == 5
+    assert rows[0]["mass"] == pytest.approx(LPlate.estimate(**points[0]).mass)
+
+
+def test_sweep_errors():
+    rows = list(sweep("BuildPlate", thickness=[2], num_x_holes=[2], workers=1))
+    assert rows[0]["error"].startswith("TypeError")
+
+
+def test_write_csv(tmp_path: Path):
+    rows = sweep(
+        BuildPlate,
+        thickness=[1, 2, 3],
+        num_x_holes=[2],
+        num_y_holes=[2, 3],
+        hole_radius=[1.6],
+        build=False,
+    )
+    assert write_rows(rows, tmp_path / "plates.csv", batch_size=4) == 6
+
+    with open(tmp_path / "plates.csv") as f:
+        lines = list(csv.DictReader(f))
+    assert len(lines) == 6
+    assert float(lines[-1]["size_z"]) == 3
+
+
+def test_write_parquet(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = sweep(
+        BuildPlate,
+        thickness=[1, 2],
+        num_x_holes=[2],
+        num_y_holes=[2],
+        hole_radius=[BoltSize.M3],
+        build=False,
+    )
+    assert write_rows(rows, tmp_path / "plates.parquet") == 2
+    assert pq.read_table(tmp_path / "plates.parquet").num_rows == 2
+
+
+def test_write_csv_errors(tmp_path: Path):
+    path = tmp_path / "plates.csv"
+    assert write_rows(_thickening_sweep(), path, batch_size=2) == 4
+
+    with open(path) as f:
+        lines = list(csv.DictReader(f))
+    assert [line["holes"] for line in lines] == ["4", "4", "", ""]
+    assert [line["error"] for line in lines] == ["", "", *["ValueError: Too thick"] * 2]
+
+    # If the first batch fails, the columns of later batches must be given
+    rows = list(_thickening_sweep())[::-1]
+    with pytest.raises(ValueError, match="holes"):
+        write_rows(rows, path, batch_size=2)
+    assert write_rows(rows, path, batch_size=2, columns=list(rows[-1])) == 4
+
+
+def test_write_parquet_errors(tmp_path: Path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "plates.parquet"
+    assert write_rows(_thickening_sweep(), path, batch_size=2) == 4
+
+    table = pq.read_table(path)
+    assert table.column("error").to_pylist()[2] == "ValueError: Too thick"
+    assert table.column("holes").to_pylist() == [4, 4, None, None]
+
+    rows = list(_thickening_sweep())[::-1]
+    columns = {name: type(value) for name, value in rows[-1].items()}
+    columns["error"] = str
+    assert write_rows(rows, path, batch_size=2, columns=columns) == 4
+    assert str(pq.read_table(path).schema.field("volume").type) == "double"